@@ -30,6 +30,13 @@ mcp_requirements = [
     "mcp>=0.1.0",
 ]
 
+# Optional performance requirements
+speedup_requirements = [
+    "orjson>=3.9.0",
+    "uvloop>=0.17.0; sys_platform != 'win32'",
+    "httptools>=0.6.0",
+]
+
 setup(
     name="gemini-context-extractor",
     version="1.0.0",
@@ -45,6 +52,7 @@ setup(
     install_requires=requirements,
     extras_require={
         "mcp": mcp_requirements,
+        "speedups": speedup_requirements,
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
@@ -8,19 +8,30 @@ __author__ = "BHD"
 __email__ = "buihongduc132@yahoo.com"
 
 from .config import get_config, save_config, GeminiConfig, BrowserConfig, ExtractionConfig
-from .enhanced_gemini_extractor import EnhancedGeminiExtractor
-from .conversation_analyzer import ConversationAnalyzer
+import importlib
 
-# Optional imports
-try:
-    from .search_based_extractor import SearchBasedExtractor
-except ImportError:
-    SearchBasedExtractor = None
+# Heavy modules (browser automation, MCP) are imported on first attribute access
+# so that importing a light submodule such as src.config stays fast.
+_LAZY_IMPORTS = {
+    "EnhancedGeminiExtractor": (".enhanced_gemini_extractor", ()),
+    "ConversationAnalyzer": (".conversation_analyzer", ()),
+    # Optional imports resolve to None when their dependencies are missing
+    "SearchBasedExtractor": (".search_based_extractor", (ImportError,)),
+    "GeminiMCPServer": (".mcp_server", (ImportError, NameError)),
+}
 
-try:
-    from .mcp_server import GeminiMCPServer
-except (ImportError, NameError):
-    GeminiMCPServer = None
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, optional_errors = _LAZY_IMPORTS[name]
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except optional_errors:
+        value = None
+    
+    globals()[name] = value
+    return value
 
 __all__ = [
     "get_config",
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Full-text index for extracted Gemini conversations
+Keeps a SQLite FTS5 trigram table in sync with the structured_*.json files so
+searches do not have to open and scan every conversation. The index only narrows
+candidates; every hit is re-checked with the same case-insensitive substring test
+as a plain scan, so results are identical.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Bump when the table layout or tokenizer changes; older tables are rebuilt
+SCHEMA_VERSION = 3
+
+# Trigram phrase queries need at least this many characters
+_MIN_TRIGRAM_QUERY = 3
+
+# Separates fields in the search text; queries containing it never match,
+# so a hit always lies within a single title or message
+SEARCH_TEXT_SEPARATOR = "\x1f"  # ASCII unit separator; NUL would cut off FTS5 tokenizing
+
+def conversation_search_text(data: Dict[str, Any]) -> str:
+    """Lowercased title and message contents flattened into one searchable string.
+    
+    A single substring test on this string runs in CPython's C search routine,
+    instead of lowercasing and scanning each message separately. Missing or null
+    fields count as empty.
+    """
+    parts = [data.get("title") or ""]
+    parts.extend(msg.get("content") or "" for msg in data.get("messages") or [])
+    return SEARCH_TEXT_SEPARATOR.join(parts).lower()
+
+def search_text_matches(search_text: str, query_lower: str) -> bool:
+    """Substring test on conversation_search_text() that never spans two fields."""
+    return SEARCH_TEXT_SEPARATOR not in query_lower and query_lower in search_text
+
+class ConversationIndex:
+    """SQLite FTS5 index over structured conversation JSON files."""
+
+    def __init__(self, extracts_dir: str, db_name: str = "index.sqlite"):
+        self.extracts_dir = Path(extracts_dir)
+        self.extracts_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.extracts_dir / db_name
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.available = self._create_tables()
+
+    def _create_tables(self) -> bool:
+        """Create the index tables; returns False when SQLite lacks FTS5 trigrams."""
+        try:
+            with self._lock, self.conn:
+                version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != SCHEMA_VERSION:
+                    # Tables from an older layout are rebuilt from the files on refresh()
+                    self.conn.execute("DROP TABLE IF EXISTS convs")
+                    self.conn.execute("DROP TABLE IF EXISTS indexed_files")
+                
+                # content holds conversation_search_text(), already lowercased
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS convs USING fts5("
+                    "id UNINDEXED, file UNINDEXED, title UNINDEXED, url UNINDEXED, "
+                    "message_count UNINDEXED, extracted_at UNINDEXED, content, "
+                    "tokenize='trigram')"
+                )
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS indexed_files ("
+                    "file TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL)"
+                )
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Full-text index unavailable: {e}")
+            return False
+        return True
+
+    def add(self, json_file: Path, data: Dict[str, Any], mtime_ns: int):
+        """Index (or re-index) one conversation."""
+        file = str(json_file)
+        content = conversation_search_text(data)
+
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM convs WHERE file = ?", (file,))
+            self.conn.execute(
+                "INSERT INTO convs (id, file, title, url, message_count, extracted_at, content) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    json_file.stem,
+                    file,
+                    data.get("title", ""),
+                    data.get("url", ""),
+                    data.get("message_count", 0),
+                    data.get("extracted_at", ""),
+                    content,
+                ),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO indexed_files (file, mtime_ns) VALUES (?, ?)",
+                (file, mtime_ns),
+            )
+
+    def add_file(self, json_file: Path):
+        """Read a conversation file from disk and index it."""
+        json_file = Path(json_file)
+        mtime_ns = json_file.stat().st_mtime_ns
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.add(json_file, data, mtime_ns)
+
+    def refresh(self):
+        """Index new or modified conversation files and drop deleted ones."""
+        with self._lock:
+            known = dict(self.conn.execute("SELECT file, mtime_ns FROM indexed_files"))
+
+        seen = set()
+        with os.scandir(self.extracts_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("structured_") and entry.name.endswith(".json")):
+                    continue
+
+                seen.add(entry.path)
+                try:
+                    if known.get(entry.path) != entry.stat(follow_symlinks=False).st_mtime_ns:
+                        self.add_file(Path(entry.path))
+                except Exception as e:
+                    print(f"⚠️ Could not index {entry.path}: {e}")
+
+        removed = [(file,) for file in known if file not in seen]
+        if removed:
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM convs WHERE file = ?", removed)
+                self.conn.executemany("DELETE FROM indexed_files WHERE file = ?", removed)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return conversations whose title or content contain the query, ignoring case."""
+        query_lower = query.lower()
+        columns = "title, url, message_count, file, extracted_at, content"
+
+        with self._lock:
+            if len(query_lower) >= _MIN_TRIGRAM_QUERY:
+                phrase = '"' + query_lower.replace('"', '""') + '"'
+                cursor = self.conn.execute(
+                    f"SELECT {columns} FROM convs WHERE convs MATCH ?", (phrase,)
+                )
+            else:
+                # Too short for trigrams: check every row
+                cursor = self.conn.execute(f"SELECT {columns} FROM convs")
+
+            results = []
+            for title, url, message_count, file, extracted_at, content in cursor:
+                # Trigram matches are candidates; confirm with the plain substring test
+                if not search_text_matches(content, query_lower):
+                    continue
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "message_count": message_count,
+                    "file": file,
+                    "extracted_at": extracted_at,
+                })
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self.conn.close()
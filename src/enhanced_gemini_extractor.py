@@ -5,12 +5,18 @@ Extracts conversations with proper message structure, sender identification, and
 """
 
 import asyncio
+import hashlib
 import json
+import os
 import re
+import shutil
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from io import BytesIO
 from datetime import datetime
 from pathlib import Path
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup, SoupStrainer
 
 try:
     from markitdown import MarkItDown
@@ -19,8 +25,43 @@ except ImportError:
     MARKITDOWN_AVAILABLE = False
     print("⚠️ markitdown not available. Install with: pip install markitdown")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Fallback HTML-to-text cleanup
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Only conversation containers are kept when parsing the chat history.
+# The class attribute is still a raw string while parsing, so match the
+# class as a whitespace-separated token rather than the whole value.
+CONVERSATION_STRAINER = SoupStrainer(
+    'div', class_=re.compile(r'(?:^|\s)conversation-container(?:\s|$)')
+)
+
+# Text timestamp formats, tried in order (the last one that matched goes first)
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%m/%d/%Y %H:%M')
+
+# Markdown conversion cache limits: entries kept in memory, files kept in .md_cache
+MD_CACHE_SIZE = 512
+MD_DISK_CACHE_FILES = 2048
+# The cache directory is pruned on the first write and then every this many writes
+MD_DISK_PRUNE_INTERVAL = 64
+
+# Static assets that carry no conversation content; aborted to speed up page loads
+BLOCKED_RESOURCE_RE = re.compile(r"\.(?:png|jpe?g|webp|gif|woff2?|ttf|mp4)(?:\?|$)", re.IGNORECASE)
+
+# Markdown heading icon and name per message sender
+SENDER_LABELS = {
+    'user': ("👤", "User"),
+    'assistant': ("🤖", "Assistant"),
+}
+
 class EnhancedGeminiExtractor:
-    def __init__(self, cdp_port: int = None, output_dir: str = None, config=None):
+    def __init__(self, cdp_port: int = None, output_dir: str = None, config=None, pool_size: int = 4):
         # Import here to avoid circular imports
         from .config import get_config
 
@@ -36,6 +77,96 @@ class EnhancedGeminiExtractor:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.markitdown = MarkItDown() if MARKITDOWN_AVAILABLE and config.extraction.use_markitdown else None
         self.config = config
+
+        # Markdown conversions keyed by content hash (in memory and on disk)
+        self.md_cache_dir = self.output_dir / ".md_cache"
+        self._md_cache = OrderedDict()  # LRU, at most MD_CACHE_SIZE entries
+        self._md_disk_writes = 0
+        self._timestamp_formats = TIMESTAMP_FORMATS
+
+        # Shared browser connection and page pool (see start/close)
+        self.pool_size = pool_size
+        self._playwright = None
+        self._pooled_pages = []
+        self._page_pool = None
+        self._start_lock = None
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def start(self):
+        """Connect once and pre-open a pool of pages reused across extractions."""
+        # Concurrent callers wait for the first one instead of connecting twice
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+            
+            # Attributes are only set once fully connected, so a failed
+            # start (e.g. Chrome not up yet) can simply be retried
+            playwright = await async_playwright().start()
+            pages = []
+            try:
+                browser = await playwright.chromium.connect_over_cdp(self.cdp_url)
+                context = browser.contexts[0] if browser.contexts else await browser.new_context()
+                
+                page_pool = asyncio.Queue()
+                for _ in range(self.pool_size):
+                    page = await context.new_page()
+                    pages.append(page)
+                    await self.block_heavy_resources(page)
+                    page_pool.put_nowait(page)
+            except Exception:
+                for page in pages:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await playwright.stop()
+                raise
+            
+            self._playwright = playwright
+            self._pooled_pages = pages
+            self._page_pool = page_pool
+    
+    async def close(self):
+        """Close pooled pages and the shared browser connection."""
+        if self._playwright is None:
+            return
+        
+        for page in self._pooled_pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        await self._playwright.stop()
+        
+        self._playwright = None
+        self._pooled_pages = []
+        self._page_pool = None
+    
+    @asynccontextmanager
+    async def acquire_page(self):
+        """Borrow a pooled page, or open a one-off connection when not started."""
+        if self._page_pool is None:
+            playwright, browser, page = await self.connect()
+            try:
+                yield page
+            finally:
+                await playwright.stop()
+            return
+        
+        page = await self._page_pool.get()
+        try:
+            yield page
+        finally:
+            self._page_pool.put_nowait(page)
     
     async def connect(self):
         """Connect to existing Chrome browser."""
@@ -43,80 +174,119 @@ class EnhancedGeminiExtractor:
         browser = await playwright.chromium.connect_over_cdp(self.cdp_url)
         
         contexts = browser.contexts
-        if contexts:
-            context = contexts[0]
-            pages = context.pages
-            if pages:
-                page = pages[0]
-            else:
-                page = await context.new_page()
+        if contexts and contexts[0].pages:
+            # The user's own tab: leave its resource loading untouched
+            page = contexts[0].pages[0]
         else:
-            context = await browser.new_context()
+            context = contexts[0] if contexts else await browser.new_context()
             page = await context.new_page()
+            await self.block_heavy_resources(page)
         
         return playwright, browser, page
     
+    async def block_heavy_resources(self, page):
+        """Abort image, font and media requests; XHR/fetch traffic is left alone.
+        
+        Only for pages this extractor opened itself, never the user's existing tabs.
+        """
+        await page.route(BLOCKED_RESOURCE_RE, lambda route: route.abort())
+    
     def parse_conversation_structure(self, html_content):
         """Parse HTML to extract structured conversation data."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find conversation containers
-        conversation_containers = soup.find_all('div', class_='conversation-container')
+        soup = BeautifulSoup(html_content, 'html.parser', parse_only=CONVERSATION_STRAINER)
         
+        # Top-level nodes are already the conversation containers
         messages = []
-        for container in conversation_containers:
+        for container in soup.find_all(recursive=False):
             message_id = container.get('id', '')
+            parts = self.scan_container(container)
+            timestamp = self.extract_timestamp(parts['time'])
             
-            # Look for user queries
-            user_query = container.find('user-query')
-            if user_query:
-                query_text = self.extract_user_message(user_query)
+            # User query
+            if parts['user_query']:
+                query_text = self.extract_user_message(parts['query_lines'])
                 if query_text:
                     messages.append({
                         'id': message_id,
                         'sender': 'user',
                         'content': query_text,
-                        'timestamp': self.extract_timestamp(container),
+                        'timestamp': timestamp,
                         'type': 'user_message'
                     })
             
-            # Look for model responses
-            model_response = container.find('model-response')
-            if model_response:
-                response_content = self.extract_model_response(model_response)
+            # Model response
+            if parts['model_response']:
+                response_content = self.extract_model_response(parts['markdown'])
                 if response_content:
                     messages.append({
                         'id': message_id,
                         'sender': 'assistant',
                         'content': response_content,
-                        'timestamp': self.extract_timestamp(container),
+                        'timestamp': timestamp,
                         'type': 'assistant_message'
                     })
         
         return messages
     
-    def extract_user_message(self, user_query_element):
-        """Extract user message content."""
+    def scan_container(self, container):
+        """Collect the message parts of a conversation container in one tree walk.
+        
+        Only the first user-query and the first model-response are used; within the
+        response only the first message-content and its first markdown div count.
+        """
+        parts = {
+            'user_query': None,
+            'query_lines': [],
+            'model_response': None,
+            'markdown': None,
+            'time': None,
+        }
+        message_content_seen = False
+        
+        # Pre-order walk that remembers which element each node belongs to
+        stack = [(child, None) for child in reversed(container.contents)]
+        while stack:
+            node, scope = stack.pop()
+            name = node.name
+            if name is None:
+                continue
+            
+            if name == 'user-query' and parts['user_query'] is None:
+                parts['user_query'] = node
+                scope = 'user-query'
+            elif name == 'model-response' and parts['model_response'] is None:
+                parts['model_response'] = node
+                scope = 'model-response'
+            elif name == 'message-content' and scope == 'model-response' and not message_content_seen:
+                message_content_seen = True
+                scope = 'message-content'
+            elif name == 'div' and scope == 'message-content' and parts['markdown'] is None \
+                    and 'markdown' in (node.get('class') or []):
+                parts['markdown'] = node
+                scope = 'markdown'
+            elif name == 'p' and scope == 'user-query' \
+                    and 'query-text-line' in (node.get('class') or []):
+                parts['query_lines'].append(node)
+            elif parts['time'] is None and (name == 'time' or 'datetime' in node.attrs):
+                parts['time'] = node
+            
+            stack.extend((child, scope) for child in reversed(node.contents))
+        
+        return parts
+    
+    def extract_user_message(self, query_lines):
+        """Extract user message content from its query text lines."""
         query_texts = []
         
-        # Look for query text elements
-        query_elements = user_query_element.find_all('p', class_='query-text-line')
-        for element in query_elements:
+        for element in query_lines:
             text = element.get_text(strip=True)
             if text and text not in ['', '\n']:
                 query_texts.append(text)
         
         return '\n'.join(query_texts) if query_texts else None
     
-    def extract_model_response(self, model_response_element):
-        """Extract model response content."""
-        # Look for message content
-        message_content = model_response_element.find('message-content')
-        if not message_content:
-            return None
-        
-        # Extract markdown content
-        markdown_div = message_content.find('div', class_='markdown')
+    def extract_model_response(self, markdown_div):
+        """Extract model response content from its markdown block."""
         if markdown_div:
             # Clean up the content
             content = self.clean_response_content(markdown_div)
@@ -139,122 +309,204 @@ class EnhancedGeminiExtractor:
         """Convert HTML element to markdown format."""
         if MARKITDOWN_AVAILABLE and self.markitdown:
             try:
-                # Create a temporary HTML file
                 temp_html = f"<html><body>{str(element)}</body></html>"
-                temp_file = self.output_dir / "temp_conversion.html"
+                html_bytes = temp_html.encode('utf-8')
+                key = hashlib.blake2b(html_bytes, digest_size=16).hexdigest()
+
+                # Reuse a previous conversion of identical HTML
+                cached = self._md_cache.get(key)
+                if cached is not None:
+                    self._md_cache.move_to_end(key)
+                    return cached
 
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    f.write(temp_html)
+                cache_file = self.md_cache_dir / key
+                if cache_file.exists():
+                    markdown = cache_file.read_text(encoding='utf-8')
+                    os.utime(cache_file)  # mtime tracks recent use for pruning
+                    self._remember_markdown(key, markdown)
+                    return markdown
 
-                # Convert using markitdown
-                result = self.markitdown.convert(str(temp_file))
+                # Convert from an in-memory stream instead of a temporary file
+                result = self.markitdown.convert_stream(BytesIO(html_bytes), file_extension='.html')
+                markdown = result.text_content.strip()
+                self._remember_markdown(key, markdown)
 
-                # Clean up temp file
-                temp_file.unlink()
+                # A failed cache write (read-only dir, full disk) keeps the conversion
+                try:
+                    self.md_cache_dir.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_text(markdown, encoding='utf-8')
+                    if self._md_disk_writes % MD_DISK_PRUNE_INTERVAL == 0:
+                        self._prune_md_cache_dir()
+                    self._md_disk_writes += 1
+                except OSError as e:
+                    print(f"⚠️ Could not write markdown cache: {e}")
 
-                return result.text_content.strip()
+                return markdown
             except Exception as e:
                 print(f"⚠️ Markitdown conversion failed: {e}")
 
         # Fallback: simple HTML to text conversion
         content = str(element)
-        content = re.sub(r'<[^>]+>', '', content)  # Remove HTML tags
-        content = re.sub(r'\s+', ' ', content)     # Normalize whitespace
+        content = _TAG_RE.sub('', content)  # Remove HTML tags
+        content = _WS_RE.sub(' ', content)  # Normalize whitespace
         content = content.strip()
 
         return content
     
-    def extract_timestamp(self, container):
-        """Extract timestamp from message container."""
-        # Look for timestamp indicators in the HTML
-        timestamp_selectors = [
-            'time',
-            '[data-timestamp]',
-            '.timestamp',
-            '.message-time',
-            '[datetime]'
-        ]
-
-        for selector in timestamp_selectors:
-            timestamp_elem = container.find(selector)
-            if timestamp_elem:
-                # Try to get datetime attribute
-                timestamp = timestamp_elem.get('datetime') or timestamp_elem.get('data-timestamp')
-                if timestamp:
-                    try:
-                        # Parse and return ISO format
-                        parsed_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        return parsed_time.isoformat()
-                    except:
-                        pass
+    def _remember_markdown(self, key, markdown):
+        """Add a conversion to the in-memory LRU, evicting the least recently used."""
+        self._md_cache[key] = markdown
+        if len(self._md_cache) > MD_CACHE_SIZE:
+            self._md_cache.popitem(last=False)
+    
+    def _prune_md_cache_dir(self):
+        """Delete the least recently used cache files beyond MD_DISK_CACHE_FILES."""
+        try:
+            with os.scandir(self.md_cache_dir) as entries:
+                files = [(entry.stat().st_mtime_ns, entry.path) for entry in entries if entry.is_file()]
+        except FileNotFoundError:
+            return
+        
+        if len(files) <= MD_DISK_CACHE_FILES:
+            return
+        
+        files.sort()
+        for _, path in files[:len(files) - MD_DISK_CACHE_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def clear_cache(self):
+        """Drop all cached markdown conversions."""
+        self._md_cache.clear()
+        if self.md_cache_dir.exists():
+            shutil.rmtree(self.md_cache_dir)
+    
+    def extract_timestamp(self, timestamp_elem):
+        """Extract timestamp from the time/[datetime] element found in a message container."""
+        if timestamp_elem is not None:
+            # Try to get datetime attribute
+            timestamp = timestamp_elem.get('datetime') or timestamp_elem.get('data-timestamp')
+            if timestamp:
+                try:
+                    # Parse and return ISO format
+                    parsed_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    return parsed_time.isoformat()
+                except:
+                    pass
 
-                # Try to parse text content
-                text_content = timestamp_elem.get_text(strip=True)
-                if text_content:
+            # Try to parse text content
+            text_content = timestamp_elem.get_text(strip=True)
+            if text_content:
+                # Try common timestamp formats, starting with the last one that worked
+                for fmt in self._timestamp_formats:
                     try:
-                        # Try common timestamp formats
-                        for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%m/%d/%Y %H:%M']:
-                            try:
-                                parsed_time = datetime.strptime(text_content, fmt)
-                                return parsed_time.isoformat()
-                            except:
-                                continue
-                    except:
-                        pass
+                        parsed_time = datetime.strptime(text_content, fmt)
+                    except ValueError:
+                        continue
+                    if fmt != self._timestamp_formats[0]:
+                        self._timestamp_formats = (fmt,) + tuple(
+                            f for f in TIMESTAMP_FORMATS if f != fmt
+                        )
+                    return parsed_time.isoformat()
 
         # Fallback: use current time
         return datetime.now().isoformat()
     
+    async def load_full_history(self, page):
+        """Scroll to the top until no older messages are being loaded."""
+        count_script = "() => document.querySelectorAll('div.conversation-container').length"
+        changed_script = (
+            "prev => document.querySelectorAll('div.conversation-container').length !== prev"
+        )
+        
+        previous = await page.evaluate(count_script)
+        stable_rounds = 0
+        for _ in range(self.config.extraction.max_scroll_attempts):
+            await page.keyboard.press('Home')
+            try:
+                await page.wait_for_function(changed_script, arg=previous, timeout=1500)
+            except PlaywrightTimeoutError:
+                pass
+            
+            current = await page.evaluate(count_script)
+            if current == previous:
+                stable_rounds += 1
+                if stable_rounds >= 2:
+                    break
+            else:
+                stable_rounds = 0
+            previous = current
+    
     async def extract_conversation_with_structure(self, conversation_url, title=""):
         """Extract conversation with proper message structure."""
         print(f"📄 Extracting structured conversation: {title}")
         
-        playwright, browser, page = await self.connect()
-        
         try:
-            # Navigate to conversation
-            await page.goto(conversation_url, wait_until="domcontentloaded", timeout=15000)
-            
-            # Wait for content to load
-            try:
-                await page.wait_for_load_state('networkidle', timeout=10000)
-            except:
-                print("⚠️ Network timeout, proceeding...")
-            
-            await page.wait_for_timeout(5000)
-            
-            # Scroll to load complete history
-            print("🔄 Loading complete conversation history...")
-            for i in range(15):
-                await page.keyboard.press('Home')
-                await page.wait_for_timeout(200)
-            
-            # Extract raw HTML
-            conversation_html = await page.evaluate('''() => {
-                const chatHistory = document.querySelector('#chat-history');
-                if (chatHistory) {
-                    return chatHistory.outerHTML;
-                }
+            async with self.acquire_page() as page:
+                # Navigate to conversation
+                await page.goto(conversation_url, wait_until="domcontentloaded", timeout=15000)
                 
-                const main = document.querySelector('main');
-                return main ? main.outerHTML : document.body.outerHTML;
-            }''')
-            
-            # Parse conversation structure
-            messages = self.parse_conversation_structure(conversation_html)
-            
-            # Save structured data
-            result = await self.save_structured_conversation(
-                conversation_html, messages, title, page.url
-            )
-            
-            return result
+                # Wait for the chat history to render
+                try:
+                    await page.wait_for_selector(
+                        '#chat-history', timeout=self.config.extraction.network_timeout
+                    )
+                except PlaywrightTimeoutError:
+                    print("⚠️ Chat history not found, proceeding...")
+                
+                # Scroll to load complete history
+                print("🔄 Loading complete conversation history...")
+                await self.load_full_history(page)
+                
+                # Extract only the conversation containers' HTML
+                conversation_html = await page.evaluate('''() => {
+                    const containers = document.querySelectorAll('div.conversation-container');
+                    if (containers.length) {
+                        return Array.from(containers, c => c.outerHTML).join('');
+                    }
+                
+                    const main = document.querySelector('main');
+                    return main ? main.outerHTML : document.body.outerHTML;
+                }''')
+                
+                # Parse conversation structure
+                messages = self.parse_conversation_structure(conversation_html)
+                
+                # Save structured data
+                result = await self.save_structured_conversation(
+                    conversation_html, messages, title, page.url
+                )
+                
+                return result
             
         except Exception as e:
             print(f"❌ Error extracting conversation: {e}")
             return None
+    
+    async def extract_many(self, urls_titles, concurrency=10):
+        """Extract several conversations concurrently.
+        
+        urls_titles is an iterable of (url, title) pairs. Results are returned in
+        the same order; failed extractions are None. Each task borrows its own
+        pooled page, so at most pool_size extractions run at once.
+        """
+        # Without the pool every task would share the user's open tab
+        started_here = self._playwright is None
+        await self.start()
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(url, title):
+            async with semaphore:
+                return await self.extract_conversation_with_structure(url, title)
+        
+        try:
+            return await asyncio.gather(*(extract_one(url, title) for url, title in urls_titles))
         finally:
-            await playwright.stop()
+            if started_here:
+                await self.close()
     
     async def save_structured_conversation(self, html_content, messages, title, url):
         """Save conversation in multiple structured formats."""
@@ -290,8 +542,12 @@ class EnhancedGeminiExtractor:
             "messages": messages
         }
         
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(structured_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(structured_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(structured_data, f, indent=2, ensure_ascii=False)
         
         # Create structured markdown
         markdown_content = self.create_structured_markdown(structured_data)
@@ -314,7 +570,7 @@ class EnhancedGeminiExtractor:
     
     def create_structured_markdown(self, structured_data):
         """Create well-formatted markdown from structured data."""
-        md_content = f"""# {structured_data['title']}
+        parts = [f"""# {structured_data['title']}
 
 **Extracted:** {structured_data['extracted_at']}  
 **URL:** {structured_data['url']}  
@@ -322,13 +578,12 @@ class EnhancedGeminiExtractor:
 
 ---
 
-"""
+"""]
         
         for i, message in enumerate(structured_data['messages']):
-            sender_icon = "👤" if message['sender'] == 'user' else "🤖"
-            sender_name = "User" if message['sender'] == 'user' else "Assistant"
+            sender_icon, sender_name = SENDER_LABELS.get(message['sender'], SENDER_LABELS['assistant'])
             
-            md_content += f"""## {sender_icon} {sender_name} (Message {i+1})
+            parts.append(f"""## {sender_icon} {sender_name} (Message {i+1})
 
 **ID:** {message['id']}  
 **Timestamp:** {message['timestamp']}  
@@ -338,13 +593,13 @@ class EnhancedGeminiExtractor:
 
 ---
 
-"""
+""")
         
-        md_content += f"""
+        parts.append(f"""
 *Extracted using Enhanced Gemini Extractor with structured message parsing*
-"""
+""")
         
-        return md_content
+        return ''.join(parts)
 
 # Usage functions
 async def extract_ioc_structured():
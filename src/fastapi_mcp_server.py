@@ -5,24 +5,46 @@ Uses FastAPI with SSE (Server-Sent Events) for MCP protocol over HTTP.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 # FastAPI imports
 try:
     from fastapi import FastAPI, Request
-    from fastapi.responses import StreamingResponse
+    from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
     from fastapi.middleware.cors import CORSMiddleware
-    from starlette.applications import Starlette
-    from starlette.routing import Route, Mount
     import uvicorn
     FASTAPI_AVAILABLE = True
 except ImportError:
     FASTAPI_AVAILABLE = False
     print("⚠️ FastAPI not available. Install with: pip install fastapi uvicorn")
 
+# Optional fast JSON encoding/decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional uvicorn speedups: libuv event loop and C HTTP parser
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
 # MCP imports
 try:
     from mcp.server import Server
@@ -38,13 +60,87 @@ except ImportError:
     print("⚠️ MCP not available. Install with: pip install mcp")
 
 from .config import get_config
-from .enhanced_gemini_extractor import EnhancedGeminiExtractor
-from .conversation_analyzer import ConversationAnalyzer
+from .conversation_index import ConversationIndex, conversation_search_text, search_text_matches
+
+async def run_blocking(func, *args):
+    """Run blocking file or index work in the default thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+# Tool responses are read by MCP clients, so they are compact unless debugging
+DEBUG_JSON = os.getenv('GEMINI_MCP_DEBUG', '').lower() == 'true'
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response to JSON text (indented when GEMINI_MCP_DEBUG=true)."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if DEBUG_JSON:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    if DEBUG_JSON:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one NDJSON line."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return json.dumps(obj).encode("utf-8") + b"\n"
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@lru_cache(maxsize=512)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Load a conversation JSON file; mtime and size make rewritten files miss the cache.
+    
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+def load_conversation(json_file: Path) -> Dict[str, Any]:
+    """Load a conversation JSON file through the mtime-keyed cache."""
+    stat = json_file.stat()
+    return _load_json_cached(str(json_file), stat.st_mtime_ns, stat.st_size)
+
+# Below this many uncached files, parsing in threads beats process start-up cost
+PROCESS_POOL_MIN_FILES = 16
+
+def summarize_conversation_file(path: str) -> Dict[str, Any]:
+    """Read the list metadata of one conversation file (runs in worker processes)."""
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    return {
+        "title": data.get("title", "Unknown"),
+        "url": data.get("url", ""),
+        "message_count": data.get("message_count", 0),
+        "extracted_at": data.get("extracted_at", "")
+    }
+
+def match_conversation_file(path: str, query: str) -> Optional[Dict[str, Any]]:
+    """Return search result info if the conversation matches (runs in worker processes)."""
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    
+    if not search_text_matches(conversation_search_text(data), query.lower()):
+        return None
+    
+    return {
+        "title": data.get("title", ""),
+        "url": data.get("url", ""),
+        "message_count": data.get("message_count", 0),
+        "file": path,
+        "extracted_at": data.get("extracted_at", "")
+    }
 
 class GeminiFastAPIMCPServer:
     """FastAPI-based HTTP MCP server for Gemini conversation extraction."""
     
-    def __init__(self, host: str = "127.0.0.1", port: int = 8000):
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, workers: int = 1):
         if not FASTAPI_AVAILABLE:
             raise ImportError("FastAPI is required. Install with: pip install fastapi uvicorn")
         
@@ -54,12 +150,37 @@ class GeminiFastAPIMCPServer:
         self.config = get_config()
         self.host = host
         self.port = port
+        self.workers = max(1, workers)
+        
+        # Full-text index over extracted conversations
+        self.index = ConversationIndex(self.config.extraction.output_dir)
+        if self.index.available:
+            self.index.refresh()
+        
+        # Shared extractor so the browser connection is reused across calls; the
+        # extractor and analyzer modules are imported on first use to keep startup fast
+        self._extractor = None
+        self._ExtractorCls = None
+        self._AnalyzerCls = None
+        
+        # Caps concurrent extractions at the extractor's page pool size; created on
+        # first use so it belongs to the running event loop
+        self._extract_sem = None
+        
+        # Conversation file stem -> path, for detail lookups without stat calls
+        self._id_to_path: Dict[str, Path] = {}
+        self._scan_conversation_ids()
+        
+        # Conversation list metadata keyed by (path, mtime_ns, size)
+        self._summaries = {}
+        self._process_pool = None
         
         # Create FastAPI app
         self.app = FastAPI(
             title="Gemini Context Extractor MCP Server",
             description="HTTP MCP server for Gemini conversation extraction and analysis",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
         )
         
         # Add CORS middleware
@@ -75,20 +196,18 @@ class GeminiFastAPIMCPServer:
         self.mcp_server = Server("gemini-context-extractor")
         
         # Setup MCP handlers
+        self._tools = self._build_tools()
         self.setup_mcp_handlers()
         
         # Setup FastAPI routes
         self.setup_routes()
         
-        # Create SSE server
-        self.sse_app = self.create_sse_server()
-        
-        # Mount SSE server
-        self.app.mount("/mcp", self.sse_app)
+        # Setup MCP SSE routes
+        self.setup_sse_routes()
     
-    def create_sse_server(self):
-        """Create a Starlette app that handles SSE connections."""
-        transport = SseServerTransport("/messages/")
+    def setup_sse_routes(self):
+        """Attach the MCP SSE endpoint and message handler directly to the FastAPI app."""
+        transport = SseServerTransport("/mcp/messages/")
         
         async def handle_sse(request):
             """Handle SSE connections for MCP."""
@@ -104,13 +223,83 @@ class GeminiFastAPIMCPServer:
                     )
                 )
         
-        # Create Starlette routes for SSE and message handling
-        routes = [
-            Route("/sse", endpoint=handle_sse),
-            Mount("/messages/", app=transport.handle_post_message),
+        self.app.add_route("/mcp/sse", handle_sse)
+        self.app.mount("/mcp/messages/", app=transport.handle_post_message)
+    
+    def _build_tools(self) -> List[Tool]:
+        """Build the (static) tool definitions once."""
+        return [
+            Tool(
+                name="extract_conversation",
+                description="Extract a Gemini conversation from URL",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "url": {"type": "string", "description": "Gemini conversation URL"},
+                        "title": {"type": "string", "description": "Optional conversation title"}
+                    },
+                    "required": ["url"]
+                }
+            ),
+            Tool(
+                name="search_conversations",
+                description="Search for conversations by query",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Search query"},
+                        "limit": {"type": "integer", "description": "Max results", "default": 10}
+                    },
+                    "required": ["query"]
+                }
+            ),
+            Tool(
+                name="analyze_conversations",
+                description="Analyze all extracted conversations",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "include_details": {"type": "boolean", "default": True}
+                    }
+                }
+            ),
+            Tool(
+                name="list_conversations",
+                description="List all available conversations",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "include_metadata": {"type": "boolean", "default": True}
+                    }
+                }
+            ),
+            Tool(
+                name="get_conversation_details",
+                description="Get detailed information about a specific conversation",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "conversation_id": {"type": "string", "description": "Conversation ID"}
+                    },
+                    "required": ["conversation_id"]
+                }
+            ),
+            Tool(
+                name="get_conversations_details",
+                description="Get detailed information about several conversations in one call",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "conversation_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Conversation IDs"
+                        }
+                    },
+                    "required": ["conversation_ids"]
+                }
+            )
         ]
-        
-        return Starlette(routes=routes)
     
     def setup_mcp_handlers(self):
         """Setup MCP protocol handlers."""
@@ -118,63 +307,7 @@ class GeminiFastAPIMCPServer:
         @self.mcp_server.list_tools()
         async def list_tools() -> List[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="extract_conversation",
-                    description="Extract a Gemini conversation from URL",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "url": {"type": "string", "description": "Gemini conversation URL"},
-                            "title": {"type": "string", "description": "Optional conversation title"}
-                        },
-                        "required": ["url"]
-                    }
-                ),
-                Tool(
-                    name="search_conversations",
-                    description="Search for conversations by query",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {"type": "string", "description": "Search query"},
-                            "limit": {"type": "integer", "description": "Max results", "default": 10}
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                Tool(
-                    name="analyze_conversations",
-                    description="Analyze all extracted conversations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "include_details": {"type": "boolean", "default": True}
-                        }
-                    }
-                ),
-                Tool(
-                    name="list_conversations",
-                    description="List all available conversations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "include_metadata": {"type": "boolean", "default": True}
-                        }
-                    }
-                ),
-                Tool(
-                    name="get_conversation_details",
-                    description="Get detailed information about a specific conversation",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "conversation_id": {"type": "string", "description": "Conversation ID"}
-                        },
-                        "required": ["conversation_id"]
-                    }
-                )
-            ]
+            return self._tools
         
         @self.mcp_server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
@@ -190,6 +323,8 @@ class GeminiFastAPIMCPServer:
                     return await self._list_conversations_tool(arguments)
                 elif name == "get_conversation_details":
                     return await self._get_conversation_details_tool(arguments)
+                elif name == "get_conversations_details":
+                    return await self._get_conversations_details_tool(arguments)
                 else:
                     raise ValueError(f"Unknown tool: {name}")
             except Exception as e:
@@ -198,18 +333,39 @@ class GeminiFastAPIMCPServer:
                     isError=True
                 )
     
+    def _get_extractor(self):
+        """Create the shared extractor, importing the browser stack on first use."""
+        if self._extractor is None:
+            if self._ExtractorCls is None:
+                from .enhanced_gemini_extractor import EnhancedGeminiExtractor
+                self._ExtractorCls = EnhancedGeminiExtractor
+            
+            self._extractor = self._ExtractorCls(
+                cdp_port=self.config.browser.cdp_port,
+                output_dir=self.config.extraction.output_dir
+            )
+        return self._extractor
+    
     async def _extract_conversation_tool(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Extract conversation tool implementation."""
         url = arguments["url"]
         title = arguments.get("title", "")
         
         try:
-            extractor = EnhancedGeminiExtractor(
-                cdp_port=self.config.browser.cdp_port,
-                output_dir=self.config.extraction.output_dir
-            )
+            extractor = self._get_extractor()
+            if self._extract_sem is None:
+                self._extract_sem = asyncio.Semaphore(extractor.pool_size)
+            
+            # Connect on first use; later calls reuse the extractor's page pool
+            await extractor.start()
+            async with self._extract_sem:
+                result = await extractor.extract_conversation_with_structure(url, title)
             
-            result = await extractor.extract_conversation_with_structure(url, title)
+            if result:
+                json_file = Path(result["json_file"])
+                self._id_to_path[json_file.stem] = json_file
+                if self.index.available:
+                    await run_blocking(self.index.add_file, json_file)
             
             response = {
                 "success": True,
@@ -218,7 +374,7 @@ class GeminiFastAPIMCPServer:
             }
             
             return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, indent=2))]
+                content=[TextContent(type="text", text=_dumps(response))]
             )
         except Exception as e:
             return CallToolResult(
@@ -232,41 +388,7 @@ class GeminiFastAPIMCPServer:
         limit = arguments.get("limit", 10)
         
         try:
-            extracts_dir = Path(self.config.extraction.output_dir)
-            results = []
-            
-            for json_file in extracts_dir.glob("structured_*.json"):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    # Simple text search
-                    title = data.get("title", "")
-                    messages = data.get("messages", [])
-                    
-                    matches = False
-                    if query.lower() in title.lower():
-                        matches = True
-                    else:
-                        for msg in messages:
-                            if query.lower() in msg.get("content", "").lower():
-                                matches = True
-                                break
-                    
-                    if matches:
-                        results.append({
-                            "title": title,
-                            "url": data.get("url", ""),
-                            "message_count": data.get("message_count", 0),
-                            "file": str(json_file),
-                            "extracted_at": data.get("extracted_at", "")
-                        })
-                    
-                    if len(results) >= limit:
-                        break
-                
-                except Exception as e:
-                    logging.warning(f"Error reading {json_file}: {e}")
+            results = [result async for result in self._iter_search_results(query, limit)]
             
             response = {
                 "success": True,
@@ -276,7 +398,7 @@ class GeminiFastAPIMCPServer:
             }
             
             return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, indent=2))]
+                content=[TextContent(type="text", text=_dumps(response))]
             )
         except Exception as e:
             return CallToolResult(
@@ -284,12 +406,38 @@ class GeminiFastAPIMCPServer:
                 isError=True
             )
     
+    def _search_index(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Search conversations through the full-text index."""
+        # Pick up files written by other extractors before querying
+        self.index.refresh()
+        return self.index.search(query, limit)
+    
+    def _conversation_files(self):
+        """List (path, mtime_ns, size) for every structured conversation file."""
+        files = []
+        with os.scandir(self.config.extraction.output_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("structured_") and entry.name.endswith(".json"):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((Path(entry.path), stat.st_mtime_ns, stat.st_size))
+        return files
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the worker process pool on first use."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._process_pool
+    
     async def _analyze_conversations_tool(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Analyze conversations tool implementation."""
         include_details = arguments.get("include_details", True)
         
         try:
-            analyzer = ConversationAnalyzer(self.config.extraction.output_dir)
+            if self._AnalyzerCls is None:
+                from .conversation_analyzer import ConversationAnalyzer
+                self._AnalyzerCls = ConversationAnalyzer
+            
+            analyzer = self._AnalyzerCls(self.config.extraction.output_dir)
             summary, analyses = analyzer.analyze_all_conversations()
             
             result = {"summary": summary}
@@ -303,7 +451,7 @@ class GeminiFastAPIMCPServer:
             }
             
             return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, indent=2))]
+                content=[TextContent(type="text", text=_dumps(response))]
             )
         except Exception as e:
             return CallToolResult(
@@ -316,30 +464,7 @@ class GeminiFastAPIMCPServer:
         include_metadata = arguments.get("include_metadata", True)
         
         try:
-            extracts_dir = Path(self.config.extraction.output_dir)
-            conversations = []
-            
-            for json_file in extracts_dir.glob("structured_*.json"):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    conv_info = {
-                        "id": json_file.stem,
-                        "title": data.get("title", "Unknown"),
-                        "message_count": data.get("message_count", 0)
-                    }
-                    
-                    if include_metadata:
-                        conv_info.update({
-                            "url": data.get("url", ""),
-                            "extracted_at": data.get("extracted_at", ""),
-                            "file": str(json_file)
-                        })
-                    
-                    conversations.append(conv_info)
-                except Exception as e:
-                    logging.warning(f"Error reading {json_file}: {e}")
+            conversations = await self._collect_conversations(include_metadata)
             
             response = {
                 "success": True,
@@ -348,7 +473,7 @@ class GeminiFastAPIMCPServer:
             }
             
             return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, indent=2))]
+                content=[TextContent(type="text", text=_dumps(response))]
             )
         except Exception as e:
             return CallToolResult(
@@ -356,33 +481,193 @@ class GeminiFastAPIMCPServer:
                 isError=True
             )
     
+    async def _collect_conversations(self, include_metadata: bool) -> List[Dict[str, Any]]:
+        """Collect summary info for every extracted conversation."""
+        return [conv_info async for conv_info in self._iter_conversations(include_metadata)]
+    
+    async def _iter_conversations(self, include_metadata: bool):
+        """Yield summary info per conversation as soon as it is available.
+        
+        Summaries are cached per (path, mtime, size) and yielded first; uncached
+        files are parsed in worker processes when there are enough of them to pay
+        for the IPC, and yielded as each one finishes.
+        """
+        entries = await run_blocking(self._conversation_files)
+        
+        # Drop summaries of files that changed or disappeared
+        self._summaries = {entry: self._summaries[entry] for entry in entries if entry in self._summaries}
+        missing = [entry for entry in entries if entry not in self._summaries]
+        
+        for entry, summary in list(self._summaries.items()):
+            yield self._conversation_info(entry[0], summary, include_metadata)
+        
+        if not missing:
+            return
+        
+        loop = asyncio.get_running_loop()
+        executor = self._get_process_pool() if len(missing) >= PROCESS_POOL_MIN_FILES else None
+        
+        async def summarize(entry):
+            return entry, await loop.run_in_executor(executor, summarize_conversation_file, str(entry[0]))
+        
+        for next_summary in asyncio.as_completed([summarize(entry) for entry in missing]):
+            try:
+                entry, summary = await next_summary
+            except Exception as e:
+                logging.warning(f"Error reading conversation file: {e}")
+                continue
+            
+            self._summaries[entry] = summary
+            yield self._conversation_info(entry[0], summary, include_metadata)
+    
+    def _conversation_info(self, json_file: Path, summary: Dict[str, Any], include_metadata: bool) -> Dict[str, Any]:
+        """Build the list entry for one conversation."""
+        conv_info = {
+            "id": json_file.stem,
+            "title": summary["title"],
+            "message_count": summary["message_count"]
+        }
+        
+        if include_metadata:
+            conv_info.update({
+                "url": summary["url"],
+                "extracted_at": summary["extracted_at"],
+                "file": str(json_file)
+            })
+        
+        return conv_info
+    
+    async def _iter_search_results(self, query: str, limit: int):
+        """Yield search results as they are found.
+        
+        Uses the full-text index when available; otherwise files are matched in
+        parallel (in worker processes when there are enough of them) and results
+        are yielded in file name order, so repeated searches return the same hits.
+        """
+        if self.index.available:
+            for result in await run_blocking(self._search_index, query, limit):
+                yield result
+            return
+        
+        entries = sorted(await run_blocking(self._conversation_files))
+        loop = asyncio.get_running_loop()
+        executor = self._get_process_pool() if len(entries) >= PROCESS_POOL_MIN_FILES else None
+        futures = [
+            loop.run_in_executor(executor, match_conversation_file, str(json_file), query)
+            for json_file, _, _ in entries
+        ]
+        
+        found = 0
+        try:
+            for future in futures:
+                try:
+                    match = await future
+                except Exception as e:
+                    logging.warning(f"Error reading conversation file: {e}")
+                    continue
+                
+                if match:
+                    yield match
+                    found += 1
+                    if found >= limit:
+                        break
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def _scan_conversation_ids(self):
+        """Rebuild the conversation ID to path map from the output directory."""
+        with os.scandir(self.config.extraction.output_dir) as entries:
+            self._id_to_path = {
+                entry.name[:-len(".json")]: Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".json")
+            }
+    
+    def _lookup_conversation_id(self, conversation_id: str) -> Optional[Path]:
+        """Look an ID up as a file stem, with or without the structured_ prefix."""
+        return (self._id_to_path.get(conversation_id)
+                or self._id_to_path.get(f"structured_{conversation_id}"))
+    
+    def _find_conversation_files(self, conversation_ids: List[str]) -> Dict[str, Optional[Path]]:
+        """Resolve conversation IDs to JSON files, rescanning at most once for misses."""
+        json_files = {cid: self._lookup_conversation_id(cid) for cid in conversation_ids}
+        if None in json_files.values():
+            # Files written by other tools (e.g. the CLI) appear after a rescan
+            self._scan_conversation_ids()
+            for cid, json_file in json_files.items():
+                if json_file is None:
+                    json_files[cid] = self._lookup_conversation_id(cid)
+        return json_files
+    
+    def _forget_conversation_file(self, json_file: Path):
+        """Drop the ID map entry of a conversation file that was deleted."""
+        if self._id_to_path.get(json_file.stem) == json_file:
+            del self._id_to_path[json_file.stem]
+    
+    def _load_existing_conversation(self, json_file: Path) -> Optional[Dict[str, Any]]:
+        """Load a conversation file, or None (forgetting its ID) if it was deleted."""
+        try:
+            return load_conversation(json_file)
+        except FileNotFoundError:
+            self._forget_conversation_file(json_file)
+            return None
+    
     async def _get_conversation_details_tool(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Get conversation details tool implementation."""
         conversation_id = arguments["conversation_id"]
         
         try:
-            extracts_dir = Path(self.config.extraction.output_dir)
-            json_file = extracts_dir / f"{conversation_id}.json"
+            json_files = await run_blocking(self._find_conversation_files, [conversation_id])
+            json_file = json_files[conversation_id]
             
-            if not json_file.exists():
-                json_file = extracts_dir / f"structured_{conversation_id}.json"
+            # The file is already valid JSON, so wrap its bytes instead of re-encoding it
+            raw = None
+            if json_file is not None:
+                try:
+                    raw = await run_blocking(json_file.read_bytes)
+                except FileNotFoundError:
+                    self._forget_conversation_file(json_file)
             
-            if not json_file.exists():
+            if raw is None:
                 return CallToolResult(
                     content=[TextContent(type="text", text=f"Conversation not found: {conversation_id}")],
                     isError=True
                 )
             
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+            payload = b'{"success":true,"conversation":' + raw + b'}'
             
+            return CallToolResult(
+                content=[TextContent(type="text", text=payload.decode('utf-8'))]
+            )
+        except Exception as e:
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"Error getting conversation details: {str(e)}")],
+                isError=True
+            )
+    
+    async def _get_conversations_details_tool(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Bulk get conversation details tool implementation."""
+        conversation_ids = arguments["conversation_ids"]
+        
+        try:
+            json_files = await run_blocking(self._find_conversation_files, conversation_ids)
+            found = [cid for cid, json_file in json_files.items() if json_file is not None]
+            
+            loaded = await asyncio.gather(
+                *(run_blocking(self._load_existing_conversation, json_files[cid]) for cid in found)
+            )
+            conversations = {cid: data for cid, data in zip(found, loaded) if data is not None}
+            
+            # Unknown IDs and files deleted since the last scan are both reported as missing
             response = {
                 "success": True,
-                "conversation": data
+                "conversations": conversations,
+                "missing": [cid for cid in json_files if cid not in conversations]
             }
             
             return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, indent=2))]
+                content=[TextContent(type="text", text=_dumps(response))]
             )
         except Exception as e:
             return CallToolResult(
@@ -393,35 +678,84 @@ class GeminiFastAPIMCPServer:
     def setup_routes(self):
         """Setup FastAPI routes."""
         
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            """Release the browser connection, worker processes and the index connection."""
+            if self._extractor is not None:
+                await self._extractor.close()
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False)
+            self.index.close()
+        
+        @self.app.get("/conversations/stream")
+        async def stream_conversations(include_metadata: bool = True):
+            """Stream conversation summaries as NDJSON while files are parsed."""
+            async def lines():
+                async for conv_info in self._iter_conversations(include_metadata):
+                    yield _dumps_line(conv_info)
+            
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+        
+        @self.app.get("/search/stream")
+        async def stream_search(query: str, limit: int = 10):
+            """Stream search results as NDJSON as soon as each match is found."""
+            async def lines():
+                async for result in self._iter_search_results(query, limit):
+                    yield _dumps_line(result)
+            
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+        
+        # Both payloads are static for the lifetime of the server
+        root_info = {
+            "service": "Gemini Context Extractor MCP Server",
+            "version": "1.0.0",
+            "status": "running",
+            "mcp_endpoint": f"http://{self.host}:{self.port}/mcp/sse",
+            "health_endpoint": f"http://{self.host}:{self.port}/health",
+            "tools": [tool.name for tool in self._tools]
+        }
+        health_info = {
+            "status": "healthy",
+            "mcp_server": "gemini-context-extractor",
+            "config": {
+                "browser": {
+                    "cdp_port": self.config.browser.cdp_port,
+                    "user_data_dir": self.config.browser.user_data_dir
+                },
+                "extraction": {
+                    "output_dir": self.config.extraction.output_dir,
+                    "use_markitdown": self.config.extraction.use_markitdown
+                }
+            }
+        }
+        
+        # Both payloads are static, so serialize them once and let clients revalidate
+        root_body, root_etag = self._static_json(root_info)
+        health_body, health_etag = self._static_json(health_info)
+        
         @self.app.get("/")
-        async def root():
+        async def root(request: Request):
             """Health check endpoint."""
-            return {
-                "service": "Gemini Context Extractor MCP Server",
-                "version": "1.0.0",
-                "status": "running",
-                "mcp_endpoint": f"http://{self.host}:{self.port}/mcp/sse",
-                "health_endpoint": f"http://{self.host}:{self.port}/health",
-                "tools": ["extract_conversation", "search_conversations", "analyze_conversations", "list_conversations", "get_conversation_details"]
-            }
+            return self._cached_response(request, root_body, root_etag)
         
         @self.app.get("/health")
-        async def health():
+        async def health(request: Request):
             """Detailed health check."""
-            return {
-                "status": "healthy",
-                "mcp_server": "gemini-context-extractor",
-                "config": {
-                    "browser": {
-                        "cdp_port": self.config.browser.cdp_port,
-                        "user_data_dir": self.config.browser.user_data_dir
-                    },
-                    "extraction": {
-                        "output_dir": self.config.extraction.output_dir,
-                        "use_markitdown": self.config.extraction.use_markitdown
-                    }
-                }
-            }
+            return self._cached_response(request, health_body, health_etag)
+    
+    @staticmethod
+    def _static_json(info: Dict[str, Any]):
+        """Serialize a static payload and derive its ETag."""
+        body = _dumps_line(info)
+        return body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    
+    @staticmethod
+    def _cached_response(request: "Request", body: bytes, etag: str) -> "Response":
+        """Return the precomputed body, or 304 when the client already has it."""
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=5"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     
     def run(self):
         """Run the FastAPI HTTP MCP server."""
@@ -429,9 +763,41 @@ class GeminiFastAPIMCPServer:
         print(f"📍 Server URL: http://{self.host}:{self.port}")
         print(f"🔌 MCP SSE Endpoint: http://{self.host}:{self.port}/mcp/sse")
         print(f"🏥 Health Check: http://{self.host}:{self.port}/health")
-        print(f"🔧 Tools: extract_conversation, search_conversations, analyze_conversations, list_conversations, get_conversation_details")
+        print(f"🔧 Tools: extract_conversation, search_conversations, analyze_conversations, list_conversations, get_conversation_details, get_conversations_details")
+        
+        options = dict(
+            host=self.host,
+            port=self.port,
+            loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+            http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+            log_level="warning",
+            access_log=False,
+        )
         
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        if self.workers == 1:
+            uvicorn.run(self.app, **options)
+            return
+        
+        # Each worker builds its own app. MCP SSE sessions live in the worker that
+        # opened them, so messages posted to another worker are lost; keep a single
+        # worker for MCP clients and use more only for the plain HTTP endpoints.
+        print(f"⚠️ Running {self.workers} workers: MCP SSE sessions are not shared between them")
+        os.environ["GEMINI_MCP_HOST"] = self.host
+        os.environ["GEMINI_MCP_PORT"] = str(self.port)
+        uvicorn.run(
+            "src.fastapi_mcp_server:build_app",
+            factory=True,
+            workers=self.workers,
+            **options,
+        )
+
+def build_app():
+    """App factory used by uvicorn worker processes."""
+    server = GeminiFastAPIMCPServer(
+        host=os.environ.get("GEMINI_MCP_HOST", "127.0.0.1"),
+        port=int(os.environ.get("GEMINI_MCP_PORT", "8000")),
+    )
+    return server.app
 
 async def main():
     """Main entry point for FastAPI HTTP MCP server."""
@@ -440,10 +806,12 @@ async def main():
     parser = argparse.ArgumentParser(description="Gemini FastAPI HTTP MCP Server")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Uvicorn worker processes (keep 1 when serving MCP over SSE)")
     
     args = parser.parse_args()
     
-    server = GeminiFastAPIMCPServer(host=args.host, port=args.port)
+    server = GeminiFastAPIMCPServer(host=args.host, port=args.port, workers=args.workers)
     server.run()
 
 if __name__ == "__main__":
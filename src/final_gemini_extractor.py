@@ -4,8 +4,12 @@ Final Gemini Extractor - Correctly distinguishes gems vs conversations and inclu
 """
 
 import asyncio
+import io
 import json
+import os
+import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright
@@ -16,342 +20,402 @@ try:
 except ImportError:
     MARKITDOWN_AVAILABLE = False
 
+# Sidebar buttons that are UI controls rather than gems or conversations
+_GEM_BLACKLIST = frozenset({'New chat', 'Search for chats', 'Settings & help'})
+_CONV_BLACKLIST = _GEM_BLACKLIST | {
+    'Sign in', 'Main menu', '2.5 Pro', 'Invite a friend', 'PRO', 'Gemini', 'Try Gemini Advanced'
+}
+_PREFIX_RE = re.compile(r'(?:2\.5|Gemini)')
+
+# Markdown lines dropped by _clean_markdown_content
+_SUGGESTION_RE = re.compile(r'Compare teachings|Analyze consequences|Illustrate Python|Simulate a virtual|Hello, Duc')
+_UI_RE = re.compile(r'menu|button|search|settings|gemini|new chat', re.IGNORECASE)
+
+# Returns {selector, count, results: [{i, title, url}]} for the first selector
+# that yields results whose text is longer than 20 characters.
+_SEARCH_RESULTS_JS = '''(selectors) => {
+    for (const selector of selectors) {
+        const elements = document.querySelectorAll(selector);
+        if (!elements.length) continue;
+        
+        const results = [];
+        elements.forEach((element, i) => {
+            const text = (element.textContent || '').trim();
+            if (text.length > 20) {
+                results.push({i, title: text.slice(0, 200), url: element.getAttribute('href')});
+            }
+        });
+        if (results.length) return {selector, count: elements.length, results};
+    }
+    return {selector: null, count: 0, results: []};
+}'''
+
+# Returns the cleaned message HTML as one string, or main.outerHTML when no
+# message survives filtering. Takes _SUGGESTION_RE's pattern as its argument.
+_EXTRACT_MESSAGES_JS = '''(suggestionPattern) => {
+    const main = document.querySelector('main');
+    if (!main) return null;
+    
+    // Look for actual conversation messages
+    const messageSelectors = [
+        '[data-message-id]',
+        'article',
+        '.message',
+        '[role="article"]',
+        '.conversation-turn'
+    ];
+    
+    let messageElements = null;
+    for (const selector of messageSelectors) {
+        messageElements = main.querySelectorAll(selector);
+        if (messageElements.length > 0) break;
+    }
+    
+    // Skip suggestion prompts and short UI fragments
+    const bad = new RegExp(suggestionPattern);
+    const parts = [];
+    for (const element of messageElements) {
+        const text = element.textContent || '';
+        if (text.length < 20 || bad.test(text)) continue;
+        parts.push('<div class="message-' + parts.length + '">' + element.outerHTML + '</div>');
+    }
+    
+    // Fall back to all content when nothing survives filtering
+    return parts.length > 0 ? parts.join('') : main.outerHTML;
+}'''
+
 class FinalGeminiExtractor:
     def __init__(self, cdp_port: int = 9222):
         self.cdp_port = cdp_port
         self.cdp_url = f"http://localhost:{cdp_port}"
         self.output_dir = Path("flow/gemini_extracts")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Session state of a context we create ourselves; kept outside the repo
+        # because it holds Google session cookies
+        self.state_path = Path.home() / ".cache" / "bhd-gemini-ctx" / "state.json"
         self.markitdown = MarkItDown() if MARKITDOWN_AVAILABLE else None
+        
+        # Browser handles shared by every command until aclose()
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._owns_context = False  # True only for a context made with new_context()
+        self._page = None
+        self._sidebar_page = None  # page whose sidebar is already open
+        self._button_cache = {}  # page.url -> (monotonic timestamp, scraped buttons)
+        self._connect_lock = None
+    
+    async def __aenter__(self):
+        await self._ensure_page()
+        return self
     
-    async def connect(self):
-        """Connect to existing Chrome browser."""
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.connect_over_cdp(self.cdp_url)
-        
-        contexts = browser.contexts
-        if contexts:
-            context = contexts[0]
-            pages = context.pages
-            if pages:
-                page = pages[0]
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def _ensure_page(self):
+        """Connect to the existing Chrome browser once and reuse its page."""
+        if self._page is not None:
+            return self._page
+        
+        # Concurrent callers (e.g. scan_all) wait for the first one instead of connecting twice
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        
+        async with self._connect_lock:
+            if self._page is not None:
+                return self._page
+            
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.connect_over_cdp(self.cdp_url)
+            
+            contexts = self._browser.contexts
+            if contexts:
+                self._context = contexts[0]
+                pages = self._context.pages
+                if pages:
+                    self._page = pages[0]
+                else:
+                    self._page = await self._context.new_page()
             else:
-                page = await context.new_page()
-        else:
-            context = await browser.new_context()
-            page = await context.new_page()
+                # Restore cookies and storage saved by the previous run
+                self._context = await self._browser.new_context(
+                    storage_state=str(self.state_path) if self.state_path.exists() else None
+                )
+                self._owns_context = True
+                self._page = await self._context.new_page()
+            
+            self._context.set_default_navigation_timeout(15000)
+            return self._page
+    
+    async def aclose(self):
+        """Stop the Playwright driver (the connected Chrome keeps running)."""
+        # Never dump the user's own Chrome session, only a context we created
+        if self._context is not None and self._owns_context:
+            try:
+                self._save_state(await self._context.storage_state())
+            except Exception as e:
+                print(f"⚠️ Could not save browser state: {e}")
+        if self._pw is not None:
+            await self._pw.stop()
+        self._pw = self._browser = self._context = self._page = None
+        self._owns_context = False
+        self._sidebar_page = None
+    
+    def _save_state(self, state):
+        """Write the storage state readable only by the current user."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(self.state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+    
+    async def _open_sidebar(self, page):
+        """Navigate to the app and open the sidebar, unless it is already open."""
+        if self._sidebar_page is page:
+            return
+        
+        # Navigate to Gemini app
+        await page.goto("https://gemini.google.com/app", wait_until="commit")
+        await self.wait_for_element(page, 'button[data-test-id="side-nav-menu-button"]', timeout=15000)
         
-        return playwright, browser, page
+        # Open sidebar
+        try:
+            menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
+            if menu_button:
+                await menu_button.click()
+                await self.wait_for_element(
+                    page, 'nav [role=listitem], [data-test-id="conversations-list"]', timeout=10000
+                )
+                self._sidebar_page = page
+        except Exception as e:
+            print(f"⚠️ Error opening sidebar: {e}")
     
-    async def wait_for_network_stability(self, page, timeout=30000):
-        """Wait for network to be stable."""
-        print("⏳ Waiting for network stability...")
+    async def wait_for_element(self, page, selector: str, timeout=15000):
+        """Wait for the element the next step needs; returns False on timeout."""
         try:
-            await page.wait_for_load_state('networkidle', timeout=timeout)
-            print("✅ Network is stable")
+            await page.wait_for_selector(selector, timeout=timeout)
+            return True
         except Exception as e:
-            print(f"⚠️ Network stability timeout: {e}")
-        await page.wait_for_timeout(2000)
+            print(f"⚠️ Timed out waiting for {selector}: {e}")
+            return False
+    
+    async def _scrape_buttons(self, page):
+        """Read every button's index and trimmed text in one round-trip."""
+        return await page.evaluate(
+            "() => Array.from(document.querySelectorAll('button'))"
+            ".map((b, i) => ({i, t: (b.textContent || '').trim()}))"
+        )
+    
+    async def _new_page(self):
+        """Open a scratch page in the shared browser context."""
+        await self._ensure_page()
+        return await self._context.new_page()
+    
+    async def scan_all(self):
+        """List gems and recent conversations concurrently on separate pages."""
+        gems_page, convs_page = await asyncio.gather(self._new_page(), self._new_page())
+        try:
+            return await asyncio.gather(
+                self.get_gems_list(page=gems_page),
+                self.get_recent_conversations(page=convs_page)
+            )
+        finally:
+            await asyncio.gather(gems_page.close(), convs_page.close())
     
-    async def get_gems_list(self):
+    async def _cached_buttons(self, page, ttl=5.0):
+        """Scrape buttons, reusing a recent scrape of the same URL."""
+        cached = self._button_cache.get(page.url)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        buttons = await self._scrape_buttons(page)
+        self._button_cache[page.url] = (time.monotonic(), buttons)
+        return buttons
+    
+    async def get_gems_list(self, page=None):
         """Get list of gems (custom apps)."""
         print("💎 Getting gems list...")
         
-        playwright, browser, page = await self.connect()
+        page = page or await self._ensure_page()
         
-        try:
-            # Navigate to Gemini app
-            await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
-            await self.wait_for_network_stability(page)
-            
-            # Open sidebar
-            try:
-                menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
-                if menu_button:
-                    await menu_button.click()
-                    await page.wait_for_timeout(2000)
-                    await self.wait_for_network_stability(page, timeout=10000)
-            except Exception as e:
-                print(f"⚠️ Error opening sidebar: {e}")
-            
-            # Look for gems (items with colons, custom apps)
-            gems = []
-            all_buttons = await page.query_selector_all('button')
-            
-            for i, button in enumerate(all_buttons):
-                try:
-                    text = await button.text_content()
-                    if text and text.strip():
-                        text_clean = text.strip()
-                        
-                        # Gems typically have colons and are custom apps
-                        if (len(text_clean) > 5 and 
-                            ':' in text_clean and
-                            text_clean not in ['New chat', 'Search for chats', 'Settings & help'] and
-                            not text_clean.startswith('2.5')):
-                            
-                            gems.append({
-                                "index": len(gems) + 1,
-                                "button_index": i,
-                                "title": text_clean,
-                                "type": "gem"
-                            })
-                except:
-                    continue
-            
-            print(f"✅ Found {len(gems)} gems:")
-            for gem in gems:
-                print(f"  {gem['index']}. [{gem['button_index']}] {gem['title']}")
-            
-            return gems
-            
-        finally:
-            await playwright.stop()
+        await self._open_sidebar(page)
+        
+        # Look for gems (items with colons, custom apps)
+        buttons = await self._cached_buttons(page)
+        
+        # Gems typically have colons and are custom apps
+        matches = [
+            b for b in buttons
+            if len(b['t']) > 5 and ':' in b['t'] and
+            b['t'] not in _GEM_BLACKLIST and not b['t'].startswith('2.5')
+        ]
+        gems = [
+            {
+                "index": n,
+                "button_index": b['i'],
+                "title": b['t'],
+                "type": "gem"
+            }
+            for n, b in enumerate(matches, 1)
+        ]
+        
+        print(f"✅ Found {len(gems)} gems:")
+        for gem in gems:
+            print(f"  {gem['index']}. [{gem['button_index']}] {gem['title']}")
+        
+        return gems
     
-    async def get_recent_conversations(self):
+    async def get_recent_conversations(self, page=None):
         """Get actual recent conversations (not gems)."""
         print("💬 Getting recent conversations...")
         
-        playwright, browser, page = await self.connect()
+        page = page or await self._ensure_page()
         
-        try:
-            # Navigate to Gemini app
-            await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
-            await self.wait_for_network_stability(page)
-            
-            # Open sidebar
-            try:
-                menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
-                if menu_button:
-                    await menu_button.click()
-                    await page.wait_for_timeout(2000)
-                    await self.wait_for_network_stability(page, timeout=10000)
-            except Exception as e:
-                print(f"⚠️ Error opening sidebar: {e}")
-            
-            # Look for actual conversations (not gems)
-            conversations = []
-            all_buttons = await page.query_selector_all('button')
-            
-            for i, button in enumerate(all_buttons):
-                try:
-                    text = await button.text_content()
-                    if text and text.strip():
-                        text_clean = text.strip()
-                        
-                        # Conversations are typically:
-                        # - Don't have colons (gems have colons)
-                        # - Are not UI elements
-                        # - Have substantial text
-                        if (len(text_clean) > 10 and 
-                            ':' not in text_clean and  # No colons = not a gem
-                            text_clean not in ['New chat', 'Search for chats', 'Settings & help', 'Sign in', 'Main menu', '2.5 Pro', 'Invite a friend', 'PRO', 'Gemini', 'Try Gemini Advanced'] and
-                            not text_clean.startswith('2.5') and
-                            not text_clean.startswith('Gemini')):
-                            
-                            conversations.append({
-                                "index": len(conversations) + 1,
-                                "button_index": i,
-                                "title": text_clean,
-                                "type": "conversation"
-                            })
-                except:
-                    continue
-            
-            print(f"✅ Found {len(conversations)} recent conversations:")
-            for conv in conversations:
-                print(f"  {conv['index']}. [{conv['button_index']}] {conv['title']}")
-            
-            return conversations
-            
-        finally:
-            await playwright.stop()
+        await self._open_sidebar(page)
+        
+        # Look for actual conversations (not gems)
+        buttons = await self._cached_buttons(page)
+        
+        # Conversations are typically:
+        # - Don't have colons (gems have colons)
+        # - Are not UI elements
+        # - Have substantial text
+        matches = [
+            b for b in buttons
+            if len(b['t']) > 10 and ':' not in b['t'] and  # No colons = not a gem
+            b['t'] not in _CONV_BLACKLIST and not _PREFIX_RE.match(b['t'])
+        ]
+        conversations = [
+            {
+                "index": n,
+                "button_index": b['i'],
+                "title": b['t'],
+                "type": "conversation"
+            }
+            for n, b in enumerate(matches, 1)
+        ]
+        
+        print(f"✅ Found {len(conversations)} recent conversations:")
+        for conv in conversations:
+            print(f"  {conv['index']}. [{conv['button_index']}] {conv['title']}")
+        
+        return conversations
     
     async def search_conversations(self, query: str):
         """Search for conversations using the search page."""
         print(f"🔍 Searching conversations for: '{query}'")
         
-        playwright, browser, page = await self.connect()
+        page = await self._ensure_page()
         
-        try:
-            # Navigate to search page
-            print("📍 Navigating to search page...")
-            await page.goto("https://gemini.google.com/search", wait_until="domcontentloaded", timeout=15000)
-            await self.wait_for_network_stability(page)
-            
-            # Find search input and enter query
-            search_input = await page.query_selector('input[type="text"], input[placeholder*="search"], textarea')
-            if search_input:
-                print(f"🔍 Entering search query: '{query}'")
-                await search_input.fill(query)
-                await page.keyboard.press('Enter')
-                await self.wait_for_network_stability(page)
-            else:
-                print("❌ Could not find search input")
-                return []
-            
-            # Extract search results
-            search_results = []
-            
-            # Look for conversation results with various selectors
-            result_selectors = [
-                '[data-testid*="result"]',
-                '.search-result',
-                '.conversation-result',
-                'article',
-                'div[role="button"]',
-                'a[href*="conversation"]',
-                'button'
-            ]
-            
-            for selector in result_selectors:
-                try:
-                    elements = await page.query_selector_all(selector)
-                    if elements:
-                        print(f"Found {len(elements)} elements with selector: {selector}")
-                        
-                        for i, element in enumerate(elements):
-                            try:
-                                text = await element.text_content()
-                                href = await element.get_attribute('href')
-                                
-                                if text and len(text.strip()) > 20:
-                                    search_results.append({
-                                        "index": i + 1,
-                                        "title": text.strip()[:200],
-                                        "url": href or "N/A",
-                                        "selector": selector
-                                    })
-                            except:
-                                continue
-                        
-                        if search_results:
-                            break
-                except Exception as e:
-                    print(f"Error with selector {selector}: {e}")
-            
-            print(f"✅ Found {len(search_results)} search results:")
-            for result in search_results[:10]:  # Show first 10
-                print(f"  {result['index']}. {result['title'][:100]}...")
-            
-            return search_results
-            
-        finally:
-            await playwright.stop()
+        # Navigate to search page
+        print("📍 Navigating to search page...")
+        self._sidebar_page = None
+        await page.goto("https://gemini.google.com/search", wait_until="commit")
+        await self.wait_for_element(page, 'input[type="text"], input[placeholder*="search"], textarea')
+        
+        # Find search input and enter query
+        search_input = await page.query_selector('input[type="text"], input[placeholder*="search"], textarea')
+        if search_input:
+            print(f"🔍 Entering search query: '{query}'")
+            await search_input.fill(query)
+            await page.keyboard.press('Enter')
+            await self.wait_for_element(page, '[data-testid*="result"], a[href*="conversation"]')
+        else:
+            print("❌ Could not find search input")
+            return []
+        
+        # Look for conversation results with various selectors
+        result_selectors = [
+            '[data-testid*="result"]',
+            '.search-result',
+            '.conversation-result',
+            'article',
+            'div[role="button"]',
+            'a[href*="conversation"]',
+            'button'
+        ]
+        
+        data = await page.evaluate(_SEARCH_RESULTS_JS, result_selectors)
+        if data['selector']:
+            print(f"Found {data['count']} elements with selector: {data['selector']}")
+        
+        search_results = [
+            {
+                "index": r['i'] + 1,
+                "title": r['title'],
+                "url": r['url'] or "N/A",
+                "selector": data['selector']
+            }
+            for r in data['results']
+        ]
+        
+        print(f"✅ Found {len(search_results)} search results:")
+        for result in search_results[:10]:  # Show first 10
+            print(f"  {result['index']}. {result['title'][:100]}...")
+        
+        return search_results
     
     async def extract_conversation_content(self, button_index: int, source_type: str = "recent"):
         """Extract conversation content, filtering out suggestions."""
         print(f"📄 Extracting conversation from button index {button_index} ({source_type})...")
         
-        playwright, browser, page = await self.connect()
+        page = await self._ensure_page()
         
-        try:
-            if source_type == "recent":
-                # Navigate to main app for recent conversations
-                await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
-                await self.wait_for_network_stability(page)
-                
-                # Open sidebar
-                try:
-                    menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
-                    if menu_button:
-                        await menu_button.click()
-                        await page.wait_for_timeout(2000)
-                        await self.wait_for_network_stability(page, timeout=10000)
-                except Exception as e:
-                    print(f"⚠️ Error opening sidebar: {e}")
-                
-                # Click the conversation
-                all_buttons = await page.query_selector_all('button')
-                if button_index >= len(all_buttons):
-                    print(f"❌ Button index {button_index} not found")
-                    return None
-                
-                target_button = all_buttons[button_index]
-                button_text = await target_button.text_content()
-                print(f"🎯 Clicking: '{button_text.strip()}'")
-                
-                await target_button.click(force=True)
-                await page.wait_for_timeout(5000)
-                await self.wait_for_network_stability(page, timeout=20000)
+        if source_type == "recent":
+            # Navigate to main app for recent conversations
+            await self._open_sidebar(page)
+            
+            # Click the conversation
+            all_buttons = await page.query_selector_all('button')
+            if button_index >= len(all_buttons):
+                print(f"❌ Button index {button_index} not found")
+                return None
             
-            # Scroll to get complete history
-            print("🔄 Scrolling to load complete conversation...")
-            for i in range(20):
-                await page.keyboard.press('Home')
-                await page.wait_for_timeout(200)
-            await self.wait_for_network_stability(page, timeout=15000)
+            target_button = all_buttons[button_index]
+            button_text = await target_button.text_content()
+            print(f"🎯 Clicking: '{button_text.strip()}'")
             
-            # Extract conversation content, filtering out suggestions
-            print("📄 Extracting conversation content (filtering suggestions)...")
+            await target_button.click(force=True)
+            self._sidebar_page = None
+            await self.wait_for_element(page, '[data-message-id], article', timeout=20000)
+        
+        # Scroll to get complete history
+        print("🔄 Scrolling to load complete conversation...")
+        await page.evaluate('''() => {
+            const main = document.querySelector('main, [role=main]');
+            if (main) main.scrollTop = 0;
+            window.scrollTo(0, 0);
+            window.__lastN = undefined;
+        }''')
+        try:
+            # Done once the message count is unchanged between two polls
+            await page.wait_for_function('''() => {
+                const n = document.querySelectorAll('[data-message-id], article').length;
+                if (window.__lastN === n) return true;
+                window.__lastN = n;
+                return false;
+            }''', timeout=15000, polling=500)
+        except Exception as e:
+            print(f"⚠️ Conversation still loading after scroll: {e}")
+        
+        # Extract conversation content, filtering out suggestions
+        print("📄 Extracting conversation content (filtering suggestions)...")
+        conversation_html = await page.evaluate(_EXTRACT_MESSAGES_JS, _SUGGESTION_RE.pattern)
+        
+        if not conversation_html or len(conversation_html.strip()) < 50:
+            print("⚠️ Limited content, getting full page...")
             conversation_html = await page.evaluate('''() => {
                 const main = document.querySelector('main');
-                if (!main) return null;
-                
-                // Look for actual conversation messages
-                const messageSelectors = [
-                    '[data-message-id]',
-                    'article',
-                    '.message',
-                    '[role="article"]',
-                    '.conversation-turn'
-                ];
-                
-                let messageElements = [];
-                for (const selector of messageSelectors) {
-                    const elements = main.querySelectorAll(selector);
-                    if (elements.length > 0) {
-                        messageElements = Array.from(elements);
-                        break;
-                    }
-                }
-                
-                // Filter out suggestion prompts and UI elements
-                const filteredElements = [];
-                messageElements.forEach(element => {
-                    const text = element.textContent || '';
-                    
-                    // Skip if it's a suggestion prompt
-                    if (text.includes('Compare teachings') || 
-                        text.includes('Analyze consequences') ||
-                        text.includes('Illustrate Python') ||
-                        text.includes('Simulate a virtual') ||
-                        text.includes('Hello, Duc') ||
-                        text.length < 20) {
-                        return;
-                    }
-                    
-                    filteredElements.push(element);
-                });
-                
-                // If we have filtered elements, use them
-                if (filteredElements.length > 0) {
-                    let content = '';
-                    filteredElements.forEach((element, index) => {
-                        content += `<div class="message-${index}">${element.outerHTML}</div>`;
-                    });
-                    return content;
-                }
-                
-                // Otherwise, get all content but filter text
-                return main.outerHTML;
+                return main ? main.innerHTML : document.body.innerHTML;
             }''')
-            
-            if not conversation_html or len(conversation_html.strip()) < 50:
-                print("⚠️ Limited content, getting full page...")
-                conversation_html = await page.evaluate('''() => {
-                    const main = document.querySelector('main');
-                    return main ? main.innerHTML : document.body.innerHTML;
-                }''')
-            
-            # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            conv_id = f"conversation_{button_index}_{source_type}"
-            
-            # Save raw HTML
-            html_file = self.output_dir / f"final_{conv_id}_{timestamp}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(f"""<!DOCTYPE html>
+        
+        # Save results
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        conv_id = f"conversation_{button_index}_{source_type}"
+        
+        # Save raw HTML
+        html_file = self.output_dir / f"final_{conv_id}_{timestamp}.html"
+        full_html = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -366,55 +430,63 @@ class FinalGeminiExtractor:
     <hr>
     {conversation_html}
 </body>
-</html>""")
-            
-            print(f"✅ Final extraction saved to: {html_file}")
-            print(f"📊 Content length: {len(conversation_html)} characters")
-            
-            # Convert to markdown
-            if self.markitdown and len(conversation_html) > 100:
-                try:
-                    result = self.markitdown.convert(str(html_file))
-                    
-                    # Clean the markdown content
-                    cleaned_content = self._clean_markdown_content(result.text_content)
-                    
-                    markdown_file = self.output_dir / f"final_{conv_id}_{timestamp}.md"
-                    with open(markdown_file, 'w', encoding='utf-8') as f:
-                        f.write(cleaned_content)
-                    print(f"✅ Cleaned markdown saved to: {markdown_file}")
-                except Exception as e:
-                    print(f"⚠️ Markdown conversion error: {e}")
-            
-            return {
-                "source_type": source_type,
-                "button_index": button_index,
-                "url": page.url,
-                "html_file": str(html_file),
-                "content_length": len(conversation_html),
-                "timestamp": timestamp
-            }
-            
-        finally:
-            await playwright.stop()
+</html>"""
+        
+        # Disk writes and markdown conversion run off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_text, html_file, full_html)
+        
+        print(f"✅ Final extraction saved to: {html_file}")
+        print(f"📊 Content length: {len(conversation_html)} characters")
+        
+        # Convert to markdown
+        if self.markitdown and len(conversation_html) > 100:
+            try:
+                markdown_file = self.output_dir / f"final_{conv_id}_{timestamp}.md"
+                await loop.run_in_executor(None, self._write_markdown, full_html, markdown_file)
+                print(f"✅ Cleaned markdown saved to: {markdown_file}")
+            except Exception as e:
+                print(f"⚠️ Markdown conversion error: {e}")
+        
+        return {
+            "source_type": source_type,
+            "button_index": button_index,
+            "url": page.url,
+            "html_file": str(html_file),
+            "content_length": len(conversation_html),
+            "timestamp": timestamp
+        }
+    
+    @staticmethod
+    def _write_text(path: Path, text: str):
+        """Write a text file (runs in a worker thread)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    def _write_markdown(self, html: str, markdown_file: Path):
+        """Convert in-memory HTML to cleaned markdown and save it (runs in a worker thread)."""
+        result = self.markitdown.convert_stream(io.BytesIO(html.encode('utf-8')), file_extension='.html')
+        
+        # Cleaned lines are written as they are produced
+        with open(markdown_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._iter_cleaned_markdown(result.text_content))
     
     def _clean_markdown_content(self, content: str) -> str:
         """Clean markdown content by removing suggestions and UI elements."""
-        lines = content.split('\n')
-        cleaned_lines = []
-        
+        return ''.join(self._iter_cleaned_markdown(content))
+    
+    def _iter_cleaned_markdown(self, content: str):
+        """Yield cleaned markdown lines (newline-terminated) with header and footer."""
         # Add header
-        cleaned_lines.extend([
-            f"# Gemini Conversation Extract",
-            "",
-            f"**Extracted:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "---",
-            ""
-        ])
+        yield "# Gemini Conversation Extract\n"
+        yield "\n"
+        yield f"**Extracted:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        yield "\n"
+        yield "---\n"
+        yield "\n"
         
         # Filter content
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
             
             # Skip empty lines and suggestions
@@ -422,30 +494,21 @@ class FinalGeminiExtractor:
                 continue
             
             # Skip suggestion prompts
-            if any(suggestion in line for suggestion in [
-                'Compare teachings', 'Analyze consequences', 'Illustrate Python',
-                'Simulate a virtual', 'Hello, Duc'
-            ]):
+            if _SUGGESTION_RE.search(line):
                 continue
             
             # Skip UI elements
-            if any(ui in line.lower() for ui in [
-                'menu', 'button', 'search', 'settings', 'gemini', 'new chat'
-            ]):
+            if _UI_RE.search(line):
                 continue
             
             # Add meaningful content
             if len(line) > 10:
-                cleaned_lines.append(line)
-        
-        cleaned_lines.extend([
-            "",
-            "---",
-            "",
-            "*Extracted with suggestion filtering*"
-        ])
+                yield line + "\n"
         
-        return '\n'.join(cleaned_lines)
+        yield "\n"
+        yield "---\n"
+        yield "\n"
+        yield "*Extracted with suggestion filtering*\n"
 
 async def main():
     """Main function."""
@@ -453,25 +516,37 @@ async def main():
         print("Usage:")
         print("  python final_gemini_extractor.py list-gems")
         print("  python final_gemini_extractor.py list-conversations")
+        print("  python final_gemini_extractor.py scan-all")
         print("  python final_gemini_extractor.py search <query>")
         print("  python final_gemini_extractor.py extract-recent <button_index>")
         return
     
-    extractor = FinalGeminiExtractor()
     command = sys.argv[1]
     
-    if command == "list-gems":
-        await extractor.get_gems_list()
-    elif command == "list-conversations":
-        await extractor.get_recent_conversations()
-    elif command == "search" and len(sys.argv) > 2:
-        query = sys.argv[2]
-        await extractor.search_conversations(query)
-    elif command == "extract-recent" and len(sys.argv) > 2:
-        button_index = int(sys.argv[2])
-        await extractor.extract_conversation_content(button_index, "recent")
-    else:
+    # Validate before connecting so bad usage never needs a running Chrome
+    if (command not in ("list-gems", "list-conversations", "scan-all", "search", "extract-recent")
+            or command in ("search", "extract-recent") and len(sys.argv) < 3):
         print("❌ Invalid command or missing arguments")
+        return
+    if command == "extract-recent":
+        try:
+            button_index = int(sys.argv[2])
+        except ValueError:
+            print(f"❌ Invalid button index: {sys.argv[2]}")
+            return
+    
+    async with FinalGeminiExtractor() as extractor:
+        if command == "list-gems":
+            await extractor.get_gems_list()
+        elif command == "list-conversations":
+            await extractor.get_recent_conversations()
+        elif command == "scan-all":
+            await extractor.scan_all()
+        elif command == "search":
+            query = sys.argv[2]
+            await extractor.search_conversations(query)
+        elif command == "extract-recent":
+            await extractor.extract_conversation_content(button_index, "recent")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -7,118 +7,241 @@ Based on actual DOM inspection and working selectors.
 import asyncio
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import rapidjson
+    RAPIDJSON_AVAILABLE = True
+except ImportError:
+    RAPIDJSON_AVAILABLE = False
+
+def _dumps(data, pretty: bool = False) -> bytes:
+    """Encode JSON with the fastest available encoder (orjson, rapidjson, json)."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if RAPIDJSON_AVAILABLE:
+        if pretty:
+            return rapidjson.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return rapidjson.dumps(data, ensure_ascii=False).encode('utf-8')
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+# Sidebar buttons that are UI controls rather than conversations
+_EXCLUDE = frozenset({
+    'New chat', 'Search for chats', 'Settings & help', 'Sign in', 'Main menu',
+    '2.5 Pro', 'Invite a friend', 'PRO'
+})
+_PREFIX = '2.5'
+
+# How long a fetched conversation list is reused without opening the browser
+CACHE_TTL_SECONDS = 60
+
 class GeminiCLI:
-    def __init__(self, cdp_port: int = 9222):
+    def __init__(self, cdp_port: int = 9222, compact: bool = True):
         self.cdp_port = cdp_port
+        self.compact = compact  # compact JSON output; False pretty-prints for debugging
         self.cdp_url = f"http://localhost:{cdp_port}"
         self.output_dir = Path("flow/gemini_extracts")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_file = self.output_dir / ".cache" / "conversations.json"
+        
+        # Playwright session shared by every command until close()
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+    
+    async def __aenter__(self):
+        # The browser is connected on the first command that needs it
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def connect(self):
-        """Connect to existing Chrome browser."""
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.connect_over_cdp(self.cdp_url)
+        """Connect to existing Chrome browser once; later calls reuse the session."""
+        if self._page is not None:
+            return self._pw, self._browser, self._page
+        
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.connect_over_cdp(self.cdp_url)
         
-        contexts = browser.contexts
+        contexts = self._browser.contexts
         if contexts:
-            context = contexts[0]
-            pages = context.pages
+            self._context = contexts[0]
+            pages = self._context.pages
             if pages:
-                page = pages[0]
+                self._page = pages[0]
             else:
-                page = await context.new_page()
+                self._page = await self._context.new_page()
         else:
-            context = await browser.new_context()
-            page = await context.new_page()
+            self._context = await self._browser.new_context()
+            self._page = await self._context.new_page()
         
-        return playwright, browser, page
+        return self._pw, self._browser, self._page
+    
+    async def close(self):
+        """Stop the Playwright driver (the connected Chrome keeps running)."""
+        if self._pw is not None:
+            await self._pw.stop()
+        self._pw = self._browser = self._context = self._page = None
     
-    async def save_results(self, data: dict, filename: str):
-        """Save results to JSON file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    async def save_results(self, data: dict, filename: str, ts: str = None):
+        """Save results to JSON file (named with the caller's timestamp if given)."""
+        timestamp = ts or f"{datetime.now():%Y%m%d_%H%M%S}"
         output_file = self.output_dir / f"{filename}_{timestamp}.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(_dumps(data, pretty=not self.compact))
         
         print(f"✅ Results saved to: {output_file}")
         return output_file
     
-    async def list_conversations(self):
-        """List all recent conversations."""
+    async def _scrape_conversation_buttons(self, page):
+        """Return index and text of conversation buttons, filtered in the browser."""
+        return await page.locator('button').evaluate_all(
+            '''(buttons, [exclude, prefix]) => {
+                const excluded = new Set(exclude);
+                return buttons
+                    .map((b, i) => ({i, t: (b.textContent || '').trim()}))
+                    .filter(b => b.t.length > 5 && !excluded.has(b.t) && !b.t.startsWith(prefix));
+            }''',
+            [sorted(_EXCLUDE), _PREFIX]
+        )
+    
+    async def _open_app(self, page):
+        """Navigate to the Gemini app and open the conversation sidebar."""
+        # Navigate to Gemini app
+        await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
+        
+        # Open sidebar
+        try:
+            menu_button = await page.wait_for_selector('button[data-test-id="side-nav-menu-button"]', timeout=15000)
+            if menu_button:
+                await menu_button.click()
+                await page.wait_for_selector('nav button, [role="navigation"] button', timeout=5000)
+                print("✅ Opened sidebar")
+        except Exception as e:
+            print(f"⚠️ Could not open sidebar: {e}")
+    
+    def _load_cache(self):
+        """Return the cached conversation list if it is fresh, else None."""
+        try:
+            if self.cache_file.stat().st_mtime < time.time() - CACHE_TTL_SECONDS:
+                return None
+            with open(self.cache_file, 'rb') as f:
+                data = f.read()
+            return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cache(self, url: str, conversations: list):
+        """Remember the latest conversation list for CACHE_TTL_SECONDS."""
+        try:
+            self.cache_file.parent.mkdir(exist_ok=True)
+            with open(self.cache_file, 'wb') as f:
+                f.write(_dumps({"url": url, "conversations": conversations}))
+        except OSError as e:
+            print(f"⚠️ Could not write conversation cache: {e}")
+    
+    async def list_conversations(self, page=None, force_refresh: bool = False):
+        """List all recent conversations (on an already opened app page if given).
+        
+        Without a page, a conversation list fetched in the last
+        CACHE_TTL_SECONDS is reused unless ``force_refresh`` is set.
+        """
         print("🔍 Listing recent conversations...")
         
+        if page is not None:
+            return await self._list_conversations(page)
+        
+        if not force_refresh:
+            cached = self._load_cache()
+            if cached is not None:
+                print("📦 Using cached conversation list")
+                return await self._save_conversation_list(cached["conversations"], cached["url"])
+        
         playwright, browser, page = await self.connect()
+        await self._open_app(page)
+        return await self._list_conversations(page)
+    
+    async def _fetch_conversations(self, page):
+        """Return the conversations in the open sidebar (no saving or printing)."""
+        # Extract conversations using working selectors; non-conversation
+        # buttons are already filtered out in the page
+        buttons = await self._scrape_conversation_buttons(page)
         
-        try:
-            # Navigate to Gemini app
-            await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
-            await page.wait_for_timeout(3000)
-            
-            # Open sidebar
-            try:
-                menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
-                if menu_button:
-                    await menu_button.click()
-                    await page.wait_for_timeout(2000)
-                    print("✅ Opened sidebar")
-            except Exception as e:
-                print(f"⚠️ Could not open sidebar: {e}")
-            
-            # Extract conversations using working selectors
-            conversations = []
-            all_buttons = await page.query_selector_all('button')
-            
-            for i, button in enumerate(all_buttons):
-                try:
-                    text = await button.text_content()
-                    if text and text.strip():
-                        text_clean = text.strip()
-                        # Filter out non-conversation buttons
-                        if (len(text_clean) > 5 and 
-                            text_clean not in ['New chat', 'Search for chats', 'Settings & help', 'Sign in', 'Main menu', '2.5 Pro', 'Invite a friend', 'PRO'] and
-                            not text_clean.startswith('2.5')):
-                            
-                            conversations.append({
-                                "id": f"button_conv_{i+1}",
-                                "title": text_clean,
-                                "button_index": i,
-                                "url": f"https://gemini.google.com/app/conversation_{i+1}"
-                            })
-                except:
-                    pass
-            
-            # Save and display results
-            results = {
-                "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
-                "task": "list_conversations",
-                "url": page.url,
-                "conversations_count": len(conversations),
-                "conversations": conversations
+        conversations = [
+            {
+                "id": f"button_conv_{b['i']+1}",
+                "title": b['t'],
+                "button_index": b['i'],
+                "url": f"https://gemini.google.com/app/conversation_{b['i']+1}"
             }
-            
-            await self.save_results(results, "conversations_list")
-            
-            print(f"✅ Found {len(conversations)} conversations:")
-            for i, conv in enumerate(conversations):
-                print(f"  {i+1}. [{conv['button_index']}] {conv['title']}")
-            
-            return results
-            
-        finally:
-            await playwright.stop()
+            for b in buttons
+        ]
+        self._store_cache(page.url, conversations)
+        return conversations
+    
+    async def _list_conversations(self, page):
+        """Scrape, save and print the conversations in the open sidebar."""
+        conversations = await self._fetch_conversations(page)
+        return await self._save_conversation_list(conversations, page.url)
+    
+    async def _save_conversation_list(self, conversations: list, url: str):
+        """Save and print a conversation list."""
+        # Save and display results
+        ts = f"{datetime.now():%Y%m%d_%H%M%S}"
+        results = {
+            "timestamp": ts,
+            "task": "list_conversations",
+            "url": url,
+            "conversations_count": len(conversations),
+            "conversations": conversations
+        }
+        
+        results["output_file"] = str(await self.save_results(results, "conversations_list", ts=ts))
+        
+        print(f"✅ Found {len(conversations)} conversations:")
+        for i, conv in enumerate(conversations):
+            print(f"  {i+1}. [{conv['button_index']}] {conv['title']}")
+        
+        return results
     
-    async def search_conversations(self, query: str):
-        """Search conversations for a specific query."""
+    async def search_conversations(self, query: str, conversations=None, page=None):
+        """Search conversations for a specific query.
+        
+        Filters an already fetched conversation list when one is given, then a
+        fresh cached list; otherwise reads the sidebar first (on ``page`` if given).
+        """
         print(f"🔍 Searching conversations for: '{query}'")
         
         # Get all conversations first
-        all_conversations_data = await self.list_conversations()
-        all_conversations = all_conversations_data.get("conversations", [])
+        cached = self._load_cache() if conversations is None and page is None else None
+        if conversations is not None:
+            all_conversations = conversations
+        elif cached is not None:
+            print("📦 Using cached conversation list")
+            all_conversations = cached["conversations"]
+        elif page is not None:
+            all_conversations = await self._fetch_conversations(page)
+        else:
+            playwright, browser, page = await self.connect()
+            await self._open_app(page)
+            all_conversations = await self._fetch_conversations(page)
         
         # Filter conversations that contain the query
         matching_conversations = []
@@ -127,8 +250,9 @@ class GeminiCLI:
                 matching_conversations.append(conv)
         
         # Save and display results
+        ts = f"{datetime.now():%Y%m%d_%H%M%S}"
         results = {
-            "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "timestamp": ts,
             "task": "search_conversations",
             "query": query,
             "total_conversations_searched": len(all_conversations),
@@ -137,7 +261,7 @@ class GeminiCLI:
             "first_result": matching_conversations[0] if matching_conversations else None
         }
         
-        await self.save_results(results, f"conversation_search_{query}")
+        results["output_file"] = str(await self.save_results(results, f"conversation_search_{query}", ts=ts))
         
         print(f"✅ Found {len(matching_conversations)} conversations matching '{query}':")
         for i, conv in enumerate(matching_conversations):
@@ -145,116 +269,157 @@ class GeminiCLI:
         
         return results
     
-    async def extract_conversation(self, button_index: int):
-        """Extract conversation content by button index."""
+    async def extract_conversation(self, button_index: int, page=None):
+        """Extract conversation content by button index (on an already opened app page if given)."""
         print(f"📄 Extracting conversation from button index {button_index}...")
         
+        if page is not None:
+            return await self._extract_conversation(page, button_index)
+        
         playwright, browser, page = await self.connect()
+        await self._open_app(page)
+        return await self._extract_conversation(page, button_index)
+    
+    async def _extract_conversation(self, page, button_index: int):
+        """Click a sidebar conversation and save its content."""
+        # Find and click the specific conversation button in one round-trip
+        clicked = await page.evaluate('''(index) => {
+            const buttons = document.querySelectorAll('button');
+            const button = buttons[index];
+            if (!button) return {count: buttons.length, text: null};
+            button.click();
+            return {count: buttons.length, text: button.textContent || ''};
+        }''', button_index)
+        if clicked['text'] is None:
+            print(f"❌ Button index {button_index} not found (max: {clicked['count']-1})")
+            return None
         
-        try:
-            # Navigate to Gemini app
-            await page.goto("https://gemini.google.com/app", wait_until="domcontentloaded", timeout=15000)
-            await page.wait_for_timeout(3000)
-            
-            # Open sidebar
-            try:
-                menu_button = await page.query_selector('button[data-test-id="side-nav-menu-button"]')
-                if menu_button:
-                    await menu_button.click()
-                    await page.wait_for_timeout(2000)
-            except:
-                pass
-            
-            # Find and click the specific conversation button
-            all_buttons = await page.query_selector_all('button')
-            if button_index >= len(all_buttons):
-                print(f"❌ Button index {button_index} not found (max: {len(all_buttons)-1})")
-                return None
-            
-            target_button = all_buttons[button_index]
-            button_text = await target_button.text_content()
-            print(f"🎯 Clicking conversation: '{button_text.strip()}'")
-            
-            await target_button.click()
-            await page.wait_for_timeout(5000)  # Wait for conversation to load
-            
-            # Scroll to top to get complete conversation history
-            print("🔄 Scrolling to load complete conversation...")
-            for i in range(15):
-                await page.keyboard.press('Home')
-                await page.wait_for_timeout(300)
-                await page.evaluate('window.scrollTo(0, 0)')
-                await page.wait_for_timeout(300)
-            
-            # Wait for content to stabilize
-            await page.wait_for_timeout(3000)
-            
-            # Extract conversation content
-            # Focus on the main conversation area, not the sidebar
-            main_content = await page.query_selector('main')
-            if not main_content:
-                print("❌ Could not find main content area")
-                return None
-            
-            # Get the page content and filter out sidebar content
-            page_text = await page.evaluate('''() => {
-                // Remove sidebar content
-                const sidebar = document.querySelector('nav, aside, [role="navigation"]');
-                if (sidebar) {
-                    sidebar.style.display = 'none';
-                }
-                
-                // Get main content text
-                const main = document.querySelector('main');
-                return main ? main.innerText : document.body.innerText;
-            }''')
-            
-            # Create markdown content
-            conv_id = button_text.strip().replace(' ', '_').replace(':', '')[:20]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        button_text = clicked['text']
+        print(f"🎯 Clicked conversation: '{button_text.strip()}'")
+        
+        await page.wait_for_timeout(5000)  # Wait for conversation to load
+        
+        # Scroll to top to get complete conversation history
+        print("🔄 Scrolling to load complete conversation...")
+        # Scroll once, then resolve after 500ms without DOM changes (2s if none
+        # occur, 15s at most while content keeps changing)
+        await page.evaluate('''async () => {
+            const main = document.querySelector('main') || document.body;
+            main.scrollTop = 0;
+            window.scrollTo(0, 0);
+            await new Promise(resolve => {
+                let observer;
+                const done = () => { observer.disconnect(); clearTimeout(cap); resolve(); };
+                let timer = setTimeout(done, 2000);
+                const cap = setTimeout(done, 15000);
+                observer = new MutationObserver(() => {
+                    clearTimeout(timer);
+                    timer = setTimeout(done, 500);
+                });
+                observer.observe(main, {childList: true, subtree: true});
+            });
+        }''')
+        
+        # Extract conversation content
+        # Focus on the main conversation area, not the sidebar
+        main_content = await page.query_selector('main')
+        if not main_content:
+            print("❌ Could not find main content area")
+            return None
+        
+        # Get the page content and filter out sidebar content
+        page_text = await page.evaluate('''() => {
+            // Remove sidebar content
+            const sidebar = document.querySelector('nav, aside, [role="navigation"]');
+            if (sidebar) {
+                sidebar.style.display = 'none';
+            }
             
-            markdown_content = f"""# Gemini Conversation: {button_text.strip()}
+            // Get main content text
+            const main = document.querySelector('main');
+            return main ? main.innerText : document.body.innerText;
+        }''')
+        
+        # Create markdown content
+        conv_id = button_text.strip().replace(' ', '_').replace(':', '')[:20]
+        now = datetime.now()
+        timestamp = f"{now:%Y%m%d_%H%M%S}"
+        
+        header = f"""# Gemini Conversation: {button_text.strip()}
 
-**Extracted:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Extracted:** {now:%Y-%m-%d %H:%M:%S}
 **URL:** {page.url}
 **Button Index:** {button_index}
 
 ---
 
-{page_text}
+"""
+        footer = """
 
 ---
 
 *Extracted using Playwright DOM inspection*
 *Note: Content may include UI elements - manual cleanup may be needed*
 """
-            
-            # Save markdown file
-            markdown_file = self.output_dir / f"conversation_{conv_id}_{timestamp}.md"
-            with open(markdown_file, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            # Save raw data
-            raw_data = {
-                "timestamp": timestamp,
-                "task": "extract_conversation",
-                "button_index": button_index,
-                "conversation_title": button_text.strip(),
-                "url": page.url,
-                "content_length": len(page_text),
-                "raw_content": page_text[:5000]  # First 5000 chars
-            }
-            
-            await self.save_results(raw_data, f"conversation_raw_{conv_id}")
-            
-            print(f"✅ Conversation extracted successfully")
-            print(f"📄 Markdown saved to: {markdown_file}")
-            print(f"📊 Content length: {len(page_text)} characters")
-            
-            return raw_data
-            
-        finally:
-            await playwright.stop()
+        
+        # Save markdown file; the (possibly large) page text is written as is
+        # rather than copied into one formatted string
+        markdown_file = self.output_dir / f"conversation_{conv_id}_{timestamp}.md"
+        with open(markdown_file, 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.write(page_text)
+            f.write(footer)
+        
+        # Save raw data
+        raw_data = {
+            "timestamp": timestamp,
+            "task": "extract_conversation",
+            "button_index": button_index,
+            "conversation_title": button_text.strip(),
+            "url": page.url,
+            "content_length": len(page_text),
+            "markdown_path": str(markdown_file)  # content lives only in the markdown file
+        }
+        
+        raw_data["output_file"] = str(await self.save_results(raw_data, f"conversation_raw_{conv_id}", ts=timestamp))
+        
+        print(f"✅ Conversation extracted successfully")
+        print(f"📄 Markdown saved to: {markdown_file}")
+        print(f"📊 Content length: {len(page_text)} characters")
+        
+        return raw_data
+    
+    async def extract_conversations(self, indices: list, max_concurrency: int = 4):
+        """Extract several conversations concurrently, each on its own page.
+        
+        Pages are opened in the signed-in browser context (a fresh context would
+        have no Gemini session), and each loads the app and sidebar itself.
+        """
+        await self.connect()
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def extract_one(button_index: int):
+            async with sem:
+                page = await self._context.new_page()
+                try:
+                    await self._open_app(page)
+                    return await self._extract_conversation(page, button_index)
+                except Exception as e:
+                    print(f"❌ Error extracting button index {button_index}: {e}")
+                    return None
+                finally:
+                    await page.close()
+        
+        return await asyncio.gather(*(extract_one(i) for i in indices))
+    
+    async def extract_all(self, query: str, max_concurrency: int = 4):
+        """Extract every conversation whose title matches the query."""
+        search = await self.search_conversations(query)
+        indices = [conv['button_index'] for conv in search['matching_conversations']]
+        
+        extracted = await self.extract_conversations(indices, max_concurrency)
+        print(f"✅ Extracted {sum(1 for r in extracted if r)}/{len(indices)} conversations matching '{query}'")
+        return extracted
     
     async def run_complete_extraction(self):
         """Run the complete extraction process as specified in WS_TODO.md."""
@@ -264,15 +429,21 @@ class GeminiCLI:
         results = {}
         
         try:
+            # One page is shared by every step
+            playwright, browser, page = await self.connect()
+            await self._open_app(page)
+            
             # 1. List conversations
             print("\nSTEP 1: Listing recent conversations")
             print("-" * 40)
-            results['conversations'] = await self.list_conversations()
+            results['conversations'] = await self.list_conversations(page=page)
             
             # 2. Search for "dy" conversations
             print("\nSTEP 2: Searching for 'dy' conversations")
             print("-" * 40)
-            results['dy_search'] = await self.search_conversations("dy")
+            results['dy_search'] = await self.search_conversations(
+                "dy", conversations=results['conversations']['conversations']
+            )
             
             # 3. Extract first "dy" conversation if found
             dy_conversations = results['dy_search'].get('matching_conversations', [])
@@ -282,10 +453,10 @@ class GeminiCLI:
                 
                 print(f"\nSTEP 3: Extracting first 'dy' conversation")
                 print("-" * 40)
-                results['extracted_conversation'] = await self.extract_conversation(button_index)
+                results['extracted_conversation'] = await self.extract_conversation(button_index, page=page)
             
             # Save complete summary
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = f"{datetime.now():%Y%m%d_%H%M%S}"
             summary = {
                 "timestamp": timestamp,
                 "task": "complete_extraction",
@@ -294,10 +465,15 @@ class GeminiCLI:
                     "dy_conversations_found": results.get('dy_search', {}).get('matching_conversations_count', 0),
                     "conversation_extracted": bool(results.get('extracted_conversation'))
                 },
-                "results": results
+                # Each step already saved its own file; reference those instead of
+                # re-encoding their contents
+                "results": {
+                    f"{step}_file": result.get("output_file") if result else None
+                    for step, result in results.items()
+                }
             }
             
-            await self.save_results(summary, "complete_extraction_summary")
+            await self.save_results(summary, "complete_extraction_summary", ts=timestamp)
             
             print("\n" + "=" * 60)
             print("EXTRACTION COMPLETE")
@@ -316,24 +492,66 @@ def main():
         print("  python gemini_cli.py list-conversations")
         print("  python gemini_cli.py search-conversations <query>")
         print("  python gemini_cli.py extract-conversation <button_index>")
+        print("  python gemini_cli.py extract-all <query>")
         print("  python gemini_cli.py complete-extraction")
+        print("  python gemini_cli.py repl")
+        print("Options:")
+        print("  --pretty  Write indented JSON results")
         return
     
-    cli = GeminiCLI()
-    command = sys.argv[1]
+    args = sys.argv[1:]
+    pretty = "--pretty" in args
+    args = [arg for arg in args if arg != "--pretty"]
     
+    asyncio.run(run_command(args[0] if args else "", args[1:], pretty=pretty))
+
+async def run_command(command: str, args: list, pretty: bool = False):
+    """Run one CLI command inside a single browser session."""
+    async with GeminiCLI(compact=not pretty) as cli:
+        if command == "repl":
+            await repl(cli)
+        else:
+            await dispatch(cli, command, args)
+
+async def dispatch(cli: GeminiCLI, command: str, args: list):
+    """Run one command against an open GeminiCLI."""
     if command == "list-conversations":
-        asyncio.run(cli.list_conversations())
-    elif command == "search-conversations" and len(sys.argv) > 2:
-        query = sys.argv[2]
-        asyncio.run(cli.search_conversations(query))
-    elif command == "extract-conversation" and len(sys.argv) > 2:
-        button_index = int(sys.argv[2])
-        asyncio.run(cli.extract_conversation(button_index))
+        await cli.list_conversations(force_refresh=True)
+    elif command == "search-conversations" and args:
+        query = args[0]
+        await cli.search_conversations(query)
+    elif command == "extract-conversation" and args:
+        button_index = int(args[0])
+        await cli.extract_conversation(button_index)
+    elif command == "extract-all" and args:
+        await cli.extract_all(args[0])
     elif command == "complete-extraction":
-        asyncio.run(cli.run_complete_extraction())
+        await cli.run_complete_extraction()
     else:
         print("❌ Invalid command or missing arguments")
 
+async def repl(cli: GeminiCLI):
+    """Read commands interactively, reusing the event loop and browser session."""
+    print("Interactive mode: enter commands without 'python gemini_cli.py'; 'exit' to quit")
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        try:
+            # Read input in a thread so Playwright keeps servicing the connection
+            line = await loop.run_in_executor(None, input, "> ")
+        except EOFError:
+            break
+        
+        parts = line.split(maxsplit=1)
+        if not parts:
+            continue
+        if parts[0] in ("exit", "quit"):
+            break
+        
+        try:
+            await dispatch(cli, parts[0], parts[1:])
+        except Exception as e:
+            print(f"❌ Error: {e}")
+
 if __name__ == "__main__":
     main()
@@ -23,9 +23,187 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from playwright.async_api import async_playwright, Browser, Page
-from markdownify import markdownify as md
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _write_json(path: Path, data) -> None:
+    """Write indented JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+# Timestamp used in result file names and payloads
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Anything a search query may contain that is unsafe in a file name
+_UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9_-]+')
+
+def _filename_part(text: str) -> str:
+    """Make user text safe to embed in a result file name."""
+    return _UNSAFE_FILENAME_RE.sub('_', text)[:40]
+
+def _text_after_title(text: str, title: str) -> str:
+    """Return text without its title, slicing it off when the title is the prefix."""
+    text = text.strip()
+    if title and text.startswith(title):
+        return text[len(title):].strip()
+    return text.replace(title, '').strip()
+
+# How long list_gems / list_recent_conversations results are reused by searches
+CACHE_TTL_SECONDS = 60
+
+# Case-insensitive substring indicators used to tell user and AI messages apart;
+# the patterns are also run in the browser so full message HTML never crosses CDP
+_USER_RE = re.compile(r'user|human|you', re.I)
+_AI_RE = re.compile(r'ai|assistant|gemini|bot', re.I)
+
+# Conversation id in a /app/<id> URL, without query string or fragment
+_APP_ID_RE = re.compile(r'/app/([^?#]+)')
+
+_TITLE_TAGS = ['h1', 'h2', 'h3', 'h4', 'strong', '.title']
+
+_READ_ELEMENTS_JS = '''(elements, titleTags) => elements.map(el => {
+    let title = null;
+    for (const tag of titleTags) {
+        const t = el.querySelector(tag);
+        if (t) { title = t.textContent; break; }
+    }
+    const a = el.querySelector('a');
+    return {
+        text: el.textContent,
+        href: el.getAttribute('href'),
+        link: a && a.getAttribute('href'),
+        title: title
+    };
+})'''
+
+_READ_MESSAGES_JS = '''(elements, [userPattern, aiPattern]) => {
+    const userRe = new RegExp(userPattern, 'i');
+    const aiRe = new RegExp(aiPattern, 'i');
+    return elements.map(el => {
+        const ts = el.querySelector('[data-testid*="timestamp"], .timestamp, time');
+        const html = el.innerHTML;
+        const blob = html + ' ' + (el.getAttribute('class') || '');
+        return {
+            text: el.textContent,
+            html: html.slice(0, 500),
+            htmlLength: html.length,
+            user: userRe.test(blob),
+            ai: aiRe.test(blob),
+            ts: ts && ts.textContent
+        };
+    });
+}'''
+
+_INDICATOR_PATTERNS = [_USER_RE.pattern, _AI_RE.pattern]
+
+# Scrolls to the top inside the browser until the page height stops changing
+_SCROLL_TO_TOP_JS = '''async () => {
+    let prev = -1;
+    for (let i = 0; i < 40; i++) {
+        window.scrollTo(0, 0);
+        await new Promise(r => setTimeout(r, 150));
+        const h = document.body.scrollHeight;
+        if (window.pageYOffset === 0 && h === prev) return h;
+        prev = h;
+    }
+    return prev;
+}'''
 
 class GeminiConversationExtractor:
+    # Candidate selectors, tried in priority order
+    _GEM_SELECTORS = (
+        '[data-testid*="gem"]',
+        '.gem-card',
+        '.gem-item',
+        '[role="button"]:has-text("Gem")',
+        'article',
+        '.card',
+        '[data-gem-id]',
+    )
+
+    _GEM_SELECTOR_UNION = ", ".join(_GEM_SELECTORS)
+
+    _POTENTIAL_GEM_SELECTORS = (
+        'div[role="button"]',
+        '.MuiCard-root',
+        '.card',
+        'article',
+        'div:has(h3)',
+        'div:has(h2)',
+    )
+
+    # Links to conversations; matches need no further filtering
+    _FOCUSED_CONVERSATION_SELECTORS = (
+        'nav a[href*="/app/"], aside a[href*="/app/"]',
+        'a[href*="/app/"]',
+    )
+
+    _CONVERSATION_LINK_UNION = ", ".join(_FOCUSED_CONVERSATION_SELECTORS)
+
+    _CONVERSATION_SELECTORS = (
+        '[data-testid*="conversation"]',
+        '[data-testid*="chat"]',
+        '.conversation-item',
+        '.chat-item',
+        'nav a',
+        'aside a',
+        '.sidebar a',
+        '[role="button"]:has-text("conversation")',
+        'div[role="button"]',
+    )
+
+    _SEARCH_INPUT_SELECTORS = (
+        'input[type="search"]',
+        'input[placeholder*="search"]',
+        'input[placeholder*="Search"]',
+        'textarea[placeholder*="search"]',
+        'input[data-testid*="search"]',
+        '.search-input',
+        '#search',
+        'input',
+    )
+
+    _SEARCH_INPUT_UNION = ", ".join(_SEARCH_INPUT_SELECTORS)
+
+    _RESULT_SELECTORS = (
+        '.search-result',
+        '.result-item',
+        '[data-testid*="result"]',
+        '.conversation-result',
+        'article',
+        '.card',
+        'div[role="button"]',
+    )
+
+    _MESSAGE_SELECTORS = (
+        '[data-testid*="message"]',
+        '[data-testid*="chat"]',
+        '.message',
+        '.chat-message',
+        '.conversation-turn',
+        'article',
+        '.user-message',
+        '.ai-message',
+        'div[role="article"]',
+        'div[data-message-id]',
+    )
+
+    _MESSAGE_SELECTOR_UNION = ", ".join(_MESSAGE_SELECTORS)
+
+    # Words that mark an element as conversation-like
+    _CONVERSATION_WORDS = ('conversation', 'chat', 'discuss')
+
+    _SIDEBAR_SELECTORS = ('nav', 'aside', '.sidebar', '[role="navigation"]')
+
+    _MAIN_SELECTORS = ('main', '.main-content', '.conversation', '.chat-container')
+
     def __init__(self, cdp_port: int = 9222):
         """Initialize the extractor with CDP connection."""
         self.cdp_port = cdp_port
@@ -34,6 +212,15 @@ class GeminiConversationExtractor:
         self.page = None
         self.playwright = None
 
+        # Last listing results, reused by the search methods, plus one
+        # lowercased search blob per listed item so queries are a single `in`
+        self._gems_cache = None
+        self._gems_cache_ts = 0
+        self._gems_blobs = []
+        self._recent_cache = None
+        self._recent_cache_ts = 0
+        self._recent_blobs = []
+
         # Create output directory
         self.output_dir = Path("flow/gemini_extracts")
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -67,110 +254,95 @@ class GeminiConversationExtractor:
         """Close the browser connection."""
         if self.playwright:
             await self.playwright.stop()
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call (serialization, disk writes) off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def _save_json(self, path: Path, data) -> None:
+        """Write a result file without blocking the event loop."""
+        await self._run_blocking(_write_json, path, data)
+
+    async def _read_elements(self, selector: str, title_tags=_TITLE_TAGS) -> List[Dict]:
+        """Read text, href and title of every match in one browser round-trip."""
+        return await self.page.locator(selector).evaluate_all(_READ_ELEMENTS_JS, list(title_tags))
+
+    async def _wait_until_loaded(self, selector: Optional[str] = None, timeout: int = 5000,
+                                 page: Optional[Page] = None):
+        """Wait for the selector to appear (or the network to go idle), capped at timeout ms."""
+        page = page or self.page
+        try:
+            if selector:
+                await page.wait_for_selector(selector, state="attached", timeout=timeout)
+            else:
+                await page.wait_for_load_state("networkidle", timeout=timeout)
+        except Exception:
+            pass
+
+    async def _probe_selectors(self, selectors, title_tags=_TITLE_TAGS) -> List:
+        """Read all candidate selectors concurrently, in order; failed probes come back empty."""
+        results = await asyncio.gather(
+            *[self._read_elements(selector, title_tags) for selector in selectors],
+            return_exceptions=True
+        )
+        return [
+            (selector, [] if isinstance(result, Exception) else result)
+            for selector, result in zip(selectors, results)
+        ]
     
     async def list_gems(self) -> Dict:
         """List all available gems."""
         print("🔍 Listing gems...")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
 
         try:
-            # Navigate to gems page with more robust loading
+            # Navigate to gems page; return on commit and wait for the content itself
             print("📍 Navigating to gems page...")
-            try:
-                await self.page.goto("https://gemini.google.com/gems/view", wait_until="domcontentloaded", timeout=15000)
-            except:
-                # Fallback: try with load event
-                await self.page.goto("https://gemini.google.com/gems/view", wait_until="load", timeout=10000)
-
-            await self.page.wait_for_timeout(5000)  # Wait for dynamic content
+            await self.page.goto("https://gemini.google.com/gems/view", wait_until="commit", timeout=15000)
+            await self._wait_until_loaded(self._GEM_SELECTOR_UNION, timeout=10000)  # Wait for dynamic content
 
             # Look for gem elements - try multiple selectors
             gems = []
+            gem_blobs = []
 
             # Try different possible selectors for gems
-            gem_selectors = [
-                '[data-testid*="gem"]',
-                '.gem-card',
-                '.gem-item',
-                '[role="button"]:has-text("Gem")',
-                'article',
-                '.card',
-                '[data-gem-id]'
-            ]
-
             gem_elements = []
-            for selector in gem_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    if elements:
-                        gem_elements = elements
-                        print(f"Found {len(elements)} elements with selector: {selector}")
-                        break
-                except:
-                    continue
+            for selector, elements in await self._probe_selectors(self._GEM_SELECTORS):
+                if elements:
+                    gem_elements = elements
+                    print(f"Found {len(elements)} elements with selector: {selector}")
+                    break
 
             # If no specific gem elements found, look for any clickable items
             if not gem_elements:
                 # Look for any cards or items that might be gems
-                potential_selectors = [
-                    'div[role="button"]',
-                    '.MuiCard-root',
-                    '.card',
-                    'article',
-                    'div:has(h3)',
-                    'div:has(h2)'
-                ]
+                for selector, elements in await self._probe_selectors(self._POTENTIAL_GEM_SELECTORS):
+                    if elements:
+                        # Filter elements that might be gems (have text content)
+                        filtered_elements = [
+                            element for element in elements
+                            if element['text'] and len(element['text'].strip()) > 10  # Has meaningful content
+                        ]
 
-                for selector in potential_selectors:
-                    try:
-                        elements = await self.page.query_selector_all(selector)
-                        if elements:
-                            # Filter elements that might be gems (have text content)
-                            filtered_elements = []
-                            for element in elements:
-                                text = await element.text_content()
-                                if text and len(text.strip()) > 10:  # Has meaningful content
-                                    filtered_elements.append(element)
-
-                            if filtered_elements:
-                                gem_elements = filtered_elements[:20]  # Limit to first 20
-                                print(f"Found {len(gem_elements)} potential gem elements with selector: {selector}")
-                                break
-                    except:
-                        continue
+                        if filtered_elements:
+                            gem_elements = filtered_elements[:20]  # Limit to first 20
+                            print(f"Found {len(gem_elements)} potential gem elements with selector: {selector}")
+                            break
 
             # Extract gem information
             for i, element in enumerate(gem_elements):
                 try:
-                    # Get text content
-                    text_content = await element.text_content()
+                    text_content = element['text']
                     if not text_content or len(text_content.strip()) < 5:
                         continue
 
-                    # Try to get href if it's a link
-                    href = None
-                    try:
-                        href = await element.get_attribute('href')
-                        if not href:
-                            # Look for a link inside the element
-                            link = await element.query_selector('a')
-                            if link:
-                                href = await link.get_attribute('href')
-                    except:
-                        pass
-
-                    # Extract title and description
-                    title = ""
-                    description = ""
+                    # Use the element's href, or a link inside it
+                    href = element['href'] or element['link']
 
-                    # Try to find title in h1, h2, h3, or strong tags
-                    for tag in ['h1', 'h2', 'h3', 'h4', 'strong', '.title']:
-                        try:
-                            title_element = await element.query_selector(tag)
-                            if title_element:
-                                title = await title_element.text_content()
-                                break
-                        except:
-                            continue
+                    # Title comes from the first h1-h4, strong or .title found in the browser
+                    title = element['title'] or ""
+                    description = ""
 
                     # If no title found, use first line of text
                     if not title:
@@ -179,7 +351,7 @@ class GeminiConversationExtractor:
 
                     # Use remaining text as description
                     if len(text_content.strip()) > len(title):
-                        description = text_content.replace(title, '').strip()[:200]
+                        description = _text_after_title(text_content, title)[:200]
 
                     gem_data = {
                         "id": f"gem_{i+1}",
@@ -190,13 +362,13 @@ class GeminiConversationExtractor:
                     }
 
                     gems.append(gem_data)
+                    gem_blobs.append(f"{gem_data['title']} {gem_data['description']} {gem_data['raw_text']}".lower())
 
                 except Exception as e:
                     print(f"Error extracting gem {i}: {e}")
                     continue
 
             # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = self.output_dir / f"gems_list_{timestamp}.json"
 
             gems_data = {
@@ -209,35 +381,41 @@ class GeminiConversationExtractor:
                 "extraction_method": "playwright_dom"
             }
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(gems_data, f, indent=2, ensure_ascii=False)
+            await self._save_json(output_file, gems_data)
+
+            self._gems_cache = gems_data
+            self._gems_cache_ts = time.time()
+            self._gems_blobs = gem_blobs
 
             print(f"✅ Found {len(gems)} gems, saved to {output_file}")
             return gems_data
 
         except Exception as e:
             print(f"❌ Error listing gems: {e}")
-            return {"error": str(e), "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")}
+            return {"error": str(e), "timestamp": timestamp}
     
     async def search_gems(self, query: str) -> Dict:
         """Search for gems with a specific query."""
         print(f"🔍 Searching gems for: {query}")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
 
         try:
-            # First get all gems
-            all_gems_data = await self.list_gems()
+            # First get all gems, reusing a recent listing if there is one
+            if self._gems_cache and time.time() - self._gems_cache_ts < CACHE_TTL_SECONDS:
+                all_gems_data = self._gems_cache
+            else:
+                all_gems_data = await self.list_gems()
             all_gems = all_gems_data.get("gems", [])
 
             # Filter gems that contain the query
-            matching_gems = []
-            for gem in all_gems:
-                gem_text = f"{gem.get('title', '')} {gem.get('description', '')} {gem.get('raw_text', '')}".lower()
-                if query.lower() in gem_text:
-                    matching_gems.append(gem)
+            query_lower = query.lower()
+            matching_gems = [
+                gem for gem, blob in zip(all_gems, self._gems_blobs)
+                if query_lower in blob
+            ]
 
             # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = self.output_dir / f"gems_search_{query}_{timestamp}.json"
+            output_file = self.output_dir / f"gems_search_{_filename_part(query)}_{timestamp}.json"
 
             search_data = {
                 "timestamp": timestamp,
@@ -251,82 +429,70 @@ class GeminiConversationExtractor:
                 "extraction_method": "playwright_dom_filter"
             }
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(search_data, f, indent=2, ensure_ascii=False)
+            await self._save_json(output_file, search_data)
 
             print(f"✅ Found {len(matching_gems)} gems matching '{query}', saved to {output_file}")
             return search_data
 
         except Exception as e:
             print(f"❌ Error searching gems: {e}")
-            return {"error": str(e), "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")}
+            return {"error": str(e), "timestamp": timestamp}
     
     async def list_recent_conversations(self) -> Dict:
         """List recent conversations from the home page."""
         print("🔍 Listing recent conversations...")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
 
         try:
-            # Navigate to Gemini home page with more robust loading
+            # Navigate to Gemini home page; return on commit and wait for the content itself
             print("📍 Navigating to Gemini home page...")
-            try:
-                await self.page.goto("https://gemini.google.com", wait_until="domcontentloaded", timeout=15000)
-            except:
-                # Fallback: try with load event
-                await self.page.goto("https://gemini.google.com", wait_until="load", timeout=10000)
-
-            await self.page.wait_for_timeout(5000)  # Wait for dynamic content
+            await self.page.goto("https://gemini.google.com", wait_until="commit", timeout=15000)
+            # Wait for the sidebar's conversation links; networkidle may never fire here
+            await self._wait_until_loaded(self._CONVERSATION_LINK_UNION)
 
             conversations = []
+            conversation_blobs = []
 
-            # Look for conversation elements in sidebar
-            conversation_selectors = [
-                '[data-testid*="conversation"]',
-                '[data-testid*="chat"]',
-                '.conversation-item',
-                '.chat-item',
-                'nav a',
-                'aside a',
-                '.sidebar a',
-                '[role="button"]:has-text("conversation")',
-                'div[role="button"]'
-            ]
-
+            # Look for conversation links first, letting the browser do the filtering
             conversation_elements = []
-            for selector in conversation_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
+            for selector, elements in await self._probe_selectors(self._FOCUSED_CONVERSATION_SELECTORS, ()):
+                if elements:
+                    conversation_elements = elements
+                    print(f"Found {len(elements)} conversation links with selector: {selector}")
+                    break
+
+            # Otherwise look for conversation elements in sidebar
+            if not conversation_elements:
+                for selector, elements in await self._probe_selectors(self._CONVERSATION_SELECTORS, ()):
                     if elements:
                         # Filter elements that look like conversations
                         filtered_elements = []
                         for element in elements:
-                            text = await element.text_content()
-                            href = await element.get_attribute('href')
+                            text = element['text'] or ""
+                            href = element['href']
+                            text_lower = text.lower()
 
                             # Check if it looks like a conversation
-                            if (text and len(text.strip()) > 5 and
-                                (href and '/app/' in href) or
-                                any(word in text.lower() for word in ['conversation', 'chat', 'discuss'])):
+                            if (len(text.strip()) > 5 and href and '/app/' in href or
+                                any(word in text_lower for word in self._CONVERSATION_WORDS)):
                                 filtered_elements.append(element)
 
                         if filtered_elements:
                             conversation_elements = filtered_elements
                             print(f"Found {len(filtered_elements)} conversation elements with selector: {selector}")
                             break
-                except:
-                    continue
 
             # If no specific conversation elements found, look for links in sidebar
             if not conversation_elements:
                 try:
                     # Look for sidebar or navigation area
-                    sidebar_selectors = ['nav', 'aside', '.sidebar', '[role="navigation"]']
-                    for sidebar_selector in sidebar_selectors:
-                        sidebar = await self.page.query_selector(sidebar_selector)
-                        if sidebar:
-                            links = await sidebar.query_selector_all('a')
+                    for sidebar_selector in self._SIDEBAR_SELECTORS:
+                        sidebar = self.page.locator(sidebar_selector).first
+                        if await sidebar.count():
+                            links = await sidebar.locator('a').evaluate_all(_READ_ELEMENTS_JS, [])
                             for link in links:
-                                href = await link.get_attribute('href')
-                                text = await link.text_content()
+                                href = link['href']
+                                text = link['text']
                                 if href and '/app/' in href and text and len(text.strip()) > 3:
                                     conversation_elements.append(link)
 
@@ -339,8 +505,8 @@ class GeminiConversationExtractor:
             # Extract conversation information
             for i, element in enumerate(conversation_elements[:20]):  # Limit to first 20
                 try:
-                    text_content = await element.text_content()
-                    href = await element.get_attribute('href')
+                    text_content = element['text']
+                    href = element['href']
 
                     if not text_content or len(text_content.strip()) < 3:
                         continue
@@ -349,9 +515,8 @@ class GeminiConversationExtractor:
                     title = text_content.strip()[:100]
 
                     # Extract conversation ID from URL
-                    conv_id = ""
-                    if href and '/app/' in href:
-                        conv_id = href.split('/app/')[-1].split('?')[0].split('#')[0]
+                    match = _APP_ID_RE.search(href) if href else None
+                    conv_id = match.group(1) if match else ""
 
                     conversation_data = {
                         "id": conv_id or f"conv_{i+1}",
@@ -361,13 +526,13 @@ class GeminiConversationExtractor:
                     }
 
                     conversations.append(conversation_data)
+                    conversation_blobs.append(f"{title} {conversation_data['raw_text']}".lower())
 
                 except Exception as e:
                     print(f"Error extracting conversation {i}: {e}")
                     continue
 
             # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = self.output_dir / f"recent_conversations_{timestamp}.json"
 
             conversations_data = {
@@ -380,74 +545,68 @@ class GeminiConversationExtractor:
                 "extraction_method": "playwright_dom"
             }
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(conversations_data, f, indent=2, ensure_ascii=False)
+            await self._save_json(output_file, conversations_data)
+
+            self._recent_cache = conversations_data
+            self._recent_cache_ts = time.time()
+            self._recent_blobs = conversation_blobs
 
             print(f"✅ Found {len(conversations)} recent conversations, saved to {output_file}")
             return conversations_data
 
         except Exception as e:
             print(f"❌ Error listing recent conversations: {e}")
-            return {"error": str(e), "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")}
+            return {"error": str(e), "timestamp": timestamp}
     
     async def search_conversations(self, query: str) -> Dict:
         """Search for conversations with a specific query."""
         print(f"🔍 Searching conversations for: {query}")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
 
         try:
-            # Navigate to search page with more robust loading
+            # Navigate to search page; return on commit and wait for the content itself
             print("📍 Navigating to search page...")
-            try:
-                await self.page.goto("https://gemini.google.com/search", wait_until="domcontentloaded", timeout=15000)
-            except:
-                # Fallback: try with load event
-                await self.page.goto("https://gemini.google.com/search", wait_until="load", timeout=10000)
-
-            await self.page.wait_for_timeout(3000)
+            await self.page.goto("https://gemini.google.com/search", wait_until="commit", timeout=15000)
+            await self._wait_until_loaded(self._SEARCH_INPUT_UNION, timeout=10000)
 
             # Look for search input
             search_input = None
-            search_selectors = [
-                'input[type="search"]',
-                'input[placeholder*="search"]',
-                'input[placeholder*="Search"]',
-                'textarea[placeholder*="search"]',
-                'input[data-testid*="search"]',
-                '.search-input',
-                '#search',
-                'input'
-            ]
 
-            for selector in search_selectors:
-                try:
-                    search_input = await self.page.query_selector(selector)
-                    if search_input:
-                        # Check if it's visible and enabled
-                        is_visible = await search_input.is_visible()
-                        is_enabled = await search_input.is_enabled()
-                        if is_visible and is_enabled:
-                            print(f"Found search input with selector: {selector}")
-                            break
-                        else:
-                            search_input = None
-                except:
-                    continue
+            async def usable_input(selector):
+                # Only a visible and enabled input counts
+                element = await self.page.query_selector(selector)
+                if element and await element.is_visible() and await element.is_enabled():
+                    return element
+                return None
+
+            candidates = await asyncio.gather(
+                *[usable_input(selector) for selector in self._SEARCH_INPUT_SELECTORS],
+                return_exceptions=True
+            )
+            for selector, candidate in zip(self._SEARCH_INPUT_SELECTORS, candidates):
+                if candidate and not isinstance(candidate, Exception):
+                    search_input = candidate
+                    print(f"Found search input with selector: {selector}")
+                    break
 
             if not search_input:
                 print("❌ Could not find search input")
                 # Try to search in recent conversations instead
-                recent_data = await self.list_recent_conversations()
+                if self._recent_cache and time.time() - self._recent_cache_ts < CACHE_TTL_SECONDS:
+                    recent_data = self._recent_cache
+                else:
+                    recent_data = await self.list_recent_conversations()
                 conversations = recent_data.get("conversations", [])
 
                 # Filter conversations that contain the query
-                matching_conversations = []
-                for conv in conversations:
-                    conv_text = f"{conv.get('title', '')} {conv.get('raw_text', '')}".lower()
-                    if query.lower() in conv_text:
-                        matching_conversations.append(conv)
+                query_lower = query.lower()
+                matching_conversations = [
+                    conv for conv, blob in zip(conversations, self._recent_blobs)
+                    if query_lower in blob
+                ]
 
                 search_data = {
-                    "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+                    "timestamp": timestamp,
                     "task": "search_conversations",
                     "query": query,
                     "url": "https://gemini.google.com/search",
@@ -458,9 +617,8 @@ class GeminiConversationExtractor:
                     "first_result": matching_conversations[0] if matching_conversations else None
                 }
 
-                output_file = self.output_dir / f"conversation_search_{query}_{search_data['timestamp']}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(search_data, f, indent=2, ensure_ascii=False)
+                output_file = self.output_dir / f"conversation_search_{_filename_part(query)}_{search_data['timestamp']}.json"
+                await self._save_json(output_file, search_data)
 
                 print(f"✅ Found {len(matching_conversations)} conversations matching '{query}' (fallback method)")
                 return search_data
@@ -470,71 +628,44 @@ class GeminiConversationExtractor:
             await search_input.press('Enter')
 
             # Wait for search results
-            await self.page.wait_for_timeout(3000)
+            await self._wait_until_loaded()
 
             # Look for search results
             search_results = []
-            result_selectors = [
-                '.search-result',
-                '.result-item',
-                '[data-testid*="result"]',
-                '.conversation-result',
-                'article',
-                '.card',
-                'div[role="button"]'
-            ]
 
             result_elements = []
-            for selector in result_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    if elements:
-                        # Filter elements that look like search results
-                        filtered_elements = []
-                        for element in elements:
-                            text = await element.text_content()
-                            if text and len(text.strip()) > 10:
-                                filtered_elements.append(element)
-
-                        if filtered_elements:
-                            result_elements = filtered_elements
-                            print(f"Found {len(filtered_elements)} search result elements")
-                            break
-                except:
-                    continue
+            for selector, elements in await self._probe_selectors(self._RESULT_SELECTORS, _TITLE_TAGS[:5]):
+                if elements:
+                    # Filter elements that look like search results
+                    filtered_elements = [
+                        element for element in elements
+                        if element['text'] and len(element['text'].strip()) > 10
+                    ]
+
+                    if filtered_elements:
+                        result_elements = filtered_elements
+                        print(f"Found {len(filtered_elements)} search result elements")
+                        break
 
             # Extract search results
             for i, element in enumerate(result_elements[:10]):  # Limit to first 10
                 try:
-                    text_content = await element.text_content()
-                    href = await element.get_attribute('href')
-
+                    text_content = element['text']
                     if not text_content or len(text_content.strip()) < 5:
                         continue
 
-                    # Try to find a link inside if no href
-                    if not href:
-                        link = await element.query_selector('a')
-                        if link:
-                            href = await link.get_attribute('href')
+                    # Fall back to a link inside if no href
+                    href = element['href'] or element['link']
 
                     # Extract title (first line or heading)
-                    title = ""
-                    for tag in ['h1', 'h2', 'h3', 'h4', 'strong']:
-                        try:
-                            title_element = await element.query_selector(tag)
-                            if title_element:
-                                title = await title_element.text_content()
-                                break
-                        except:
-                            continue
+                    title = element['title'] or ""
 
                     if not title:
                         lines = text_content.strip().split('\n')
                         title = lines[0][:100] if lines else f"Result {i+1}"
 
                     # Use remaining text as preview
-                    preview = text_content.replace(title, '').strip()[:200]
+                    preview = _text_after_title(text_content, title)[:200]
 
                     result_data = {
                         "id": f"search_result_{i+1}",
@@ -551,8 +682,7 @@ class GeminiConversationExtractor:
                     continue
 
             # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = self.output_dir / f"conversation_search_{query}_{timestamp}.json"
+            output_file = self.output_dir / f"conversation_search_{_filename_part(query)}_{timestamp}.json"
 
             search_data = {
                 "timestamp": timestamp,
@@ -567,97 +697,67 @@ class GeminiConversationExtractor:
                 "extraction_method": "playwright_dom"
             }
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(search_data, f, indent=2, ensure_ascii=False)
+            await self._save_json(output_file, search_data)
 
             print(f"✅ Found {len(search_results)} search results for '{query}', saved to {output_file}")
             return search_data
 
         except Exception as e:
             print(f"❌ Error searching conversations: {e}")
-            return {"error": str(e), "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")}
+            return {"error": str(e), "timestamp": timestamp}
 
-    async def extract_conversation_content(self, conversation_url: str) -> Dict:
-        """Extract full conversation content from a specific URL."""
+    async def extract_conversation_content(self, conversation_url: str, page: Optional[Page] = None) -> Dict:
+        """Extract full conversation content from a specific URL, on the given page or the main one."""
+        page = page or self.page
         print(f"📄 Extracting conversation content from: {conversation_url}")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
 
         try:
-            # Navigate to conversation with more robust loading
+            # Navigate to conversation; return on commit and wait for the content itself
             print(f"📍 Navigating to conversation: {conversation_url}")
-            try:
-                await self.page.goto(conversation_url, wait_until="domcontentloaded", timeout=15000)
-            except:
-                # Fallback: try with load event
-                await self.page.goto(conversation_url, wait_until="load", timeout=10000)
-
-            await self.page.wait_for_timeout(5000)
+            await page.goto(conversation_url, wait_until="commit", timeout=15000)
+            await self._wait_until_loaded(self._MESSAGE_SELECTOR_UNION, timeout=10000, page=page)
 
             # Scroll to top to load all messages
             print("🔄 Scrolling to load complete conversation history...")
 
-            # Scroll to the very top multiple times to ensure all content is loaded
-            for i in range(10):
-                await self.page.keyboard.press('Home')
-                await self.page.wait_for_timeout(500)
-
-                # Also try scrolling up
-                await self.page.evaluate('window.scrollTo(0, 0)')
-                await self.page.wait_for_timeout(500)
-
-                # Check if we can scroll up more
-                scroll_position = await self.page.evaluate('window.pageYOffset')
-                if scroll_position == 0:
-                    # Try a few more times to be sure
-                    for _ in range(3):
-                        await self.page.keyboard.press('PageUp')
-                        await self.page.wait_for_timeout(300)
-
-            # Wait for content to stabilize
-            await self.page.wait_for_timeout(2000)
+            # Keep scrolling to the top until the page height stops changing
+            await page.evaluate(_SCROLL_TO_TOP_JS)
 
             # Look for conversation messages
             messages = []
 
             # Try different selectors for message elements
-            message_selectors = [
-                '[data-testid*="message"]',
-                '[data-testid*="chat"]',
-                '.message',
-                '.chat-message',
-                '.conversation-turn',
-                'article',
-                '.user-message',
-                '.ai-message',
-                'div[role="article"]',
-                'div[data-message-id]'
-            ]
-
             message_elements = []
-            for selector in message_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    if elements and len(elements) > 1:  # Should have multiple messages
-                        message_elements = elements
-                        print(f"Found {len(elements)} message elements with selector: {selector}")
-                        break
-                except:
-                    continue
+            probes = await asyncio.gather(
+                *[
+                    page.locator(selector).evaluate_all(_READ_MESSAGES_JS, _INDICATOR_PATTERNS)
+                    for selector in self._MESSAGE_SELECTORS
+                ],
+                return_exceptions=True
+            )
+            for selector, elements in zip(self._MESSAGE_SELECTORS, probes):
+                if isinstance(elements, list) and len(elements) > 1:  # Should have multiple messages
+                    message_elements = elements
+                    print(f"Found {len(elements)} message elements with selector: {selector}")
+                    break
 
             # If no specific message elements found, look for any content blocks
             if not message_elements:
                 try:
                     # Look for main content area
-                    main_selectors = ['main', '.main-content', '.conversation', '.chat-container']
-                    for main_selector in main_selectors:
-                        main_element = await self.page.query_selector(main_selector)
-                        if main_element:
+                    for main_selector in self._MAIN_SELECTORS:
+                        main_element = page.locator(main_selector).first
+                        if await main_element.count():
                             # Look for any div elements that might contain messages
-                            divs = await main_element.query_selector_all('div')
+                            divs = await main_element.locator('div').evaluate_all(
+                                _READ_MESSAGES_JS, _INDICATOR_PATTERNS
+                            )
                             # Filter divs that have substantial text content
-                            for div in divs:
-                                text = await div.text_content()
-                                if text and len(text.strip()) > 20:
-                                    message_elements.append(div)
+                            message_elements = [
+                                div for div in divs
+                                if div['text'] and len(div['text'].strip()) > 20
+                            ]
 
                             if message_elements:
                                 print(f"Found {len(message_elements)} potential message elements in main content")
@@ -668,22 +768,17 @@ class GeminiConversationExtractor:
             # Extract message content
             for i, element in enumerate(message_elements):
                 try:
-                    text_content = await element.text_content()
+                    text_content = element['text']
                     if not text_content or len(text_content.strip()) < 10:
                         continue
 
                     # Try to determine if it's user or AI message
                     message_type = "unknown"
 
-                    # Look for indicators in the element or its parents
-                    element_html = await element.inner_html()
-                    element_classes = await element.get_attribute('class') or ""
-
-                    if any(indicator in element_html.lower() or indicator in element_classes.lower()
-                           for indicator in ['user', 'human', 'you']):
+                    # Indicators in the element's HTML and class were matched in the browser
+                    if element['user']:
                         message_type = "user"
-                    elif any(indicator in element_html.lower() or indicator in element_classes.lower()
-                             for indicator in ['ai', 'assistant', 'gemini', 'bot']):
+                    elif element['ai']:
                         message_type = "ai"
                     else:
                         # Try to guess based on content patterns
@@ -692,21 +787,15 @@ class GeminiConversationExtractor:
                         else:
                             message_type = "ai"
 
-                    # Look for timestamps
-                    timestamp_text = ""
-                    try:
-                        timestamp_element = await element.query_selector('[data-testid*="timestamp"], .timestamp, time')
-                        if timestamp_element:
-                            timestamp_text = await timestamp_element.text_content()
-                    except:
-                        pass
+                    # Timestamp text was read in the browser alongside the message
+                    timestamp_text = element['ts']
 
                     message_data = {
                         "index": i,
                         "type": message_type,
                         "content": text_content.strip(),
                         "timestamp": timestamp_text.strip() if timestamp_text else "",
-                        "html": element_html[:500] if len(element_html) < 500 else element_html[:500] + "..."
+                        "html": element['html'] if element['htmlLength'] < 500 else element['html'] + "..."
                     }
 
                     messages.append(message_data)
@@ -719,7 +808,6 @@ class GeminiConversationExtractor:
             markdown_content = self._convert_messages_to_markdown(messages, conversation_url)
 
             # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             conv_id = conversation_url.split('/')[-1] if '/' in conversation_url else "unknown"
 
             # Save raw data
@@ -730,24 +818,38 @@ class GeminiConversationExtractor:
                 "url": conversation_url,
                 "messages_count": len(messages),
                 "messages": messages,
-                "page_title": await self.page.title(),
+                "page_title": await page.title(),
                 "extraction_method": "playwright_dom_with_scrolling"
             }
 
-            with open(raw_file, 'w', encoding='utf-8') as f:
-                json.dump(raw_data, f, indent=2, ensure_ascii=False)
-
-            # Save markdown
+            # Save markdown alongside it
             markdown_file = self.output_dir / f"conversation_{conv_id}_{timestamp}.md"
-            with open(markdown_file, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+            await asyncio.gather(
+                self._save_json(raw_file, raw_data),
+                self._run_blocking(markdown_file.write_text, markdown_content, 'utf-8')
+            )
 
             print(f"✅ Extracted {len(messages)} messages, saved to {raw_file} and {markdown_file}")
             return raw_data
 
         except Exception as e:
             print(f"❌ Error extracting conversation content: {e}")
-            return {"error": str(e), "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")}
+            return {"error": str(e), "timestamp": timestamp}
+
+    async def extract_conversations_batch(self, urls: List[str], concurrency: int = 4) -> List[Dict]:
+        """Extract several conversations in parallel pages of the current browser context."""
+        semaphore = asyncio.Semaphore(concurrency)
+        context = self.page.context
+
+        async def extract_one(url):
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    return await self.extract_conversation_content(url, page=page)
+                finally:
+                    await page.close()
+
+        return await asyncio.gather(*[extract_one(url) for url in urls])
 
     def _convert_messages_to_markdown(self, messages: List[Dict], url: str) -> str:
         """Convert extracted messages to markdown format."""
@@ -845,7 +947,7 @@ class GeminiConversationExtractor:
                 results['first_conversation_content'] = await self.extract_conversation_content(first_conversation_url)
 
             # Save summary
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
             summary_file = self.output_dir / f"extraction_summary_{timestamp}.json"
 
             summary_data = {
@@ -862,8 +964,7 @@ class GeminiConversationExtractor:
                 "results": results
             }
 
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, indent=2, ensure_ascii=False)
+            await self._save_json(summary_file, summary_data)
 
             print(f"\n✅ Complete extraction summary saved to {summary_file}")
 
@@ -7,7 +7,9 @@ Provides AI agents with HTTP-based access to Gemini conversation data using Fast
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 # FastAPI imports
@@ -29,9 +31,26 @@ except ImportError:
     FASTMCP_AVAILABLE = False
     print("⚠️ FastMCP not available. Install with: pip install fastmcp")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import get_config
-from .enhanced_gemini_extractor import EnhancedGeminiExtractor
-from .conversation_analyzer import ConversationAnalyzer
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+# Maximum number of parsed conversation files kept in memory
+CONVERSATION_CACHE_SIZE = 256
+
+# Word tokens used by the in-memory search index
+_TOKEN_RE = re.compile(r"\w+")
 
 class GeminiHTTPMCPServer:
     """HTTP MCP server for Gemini conversation extraction and analysis."""
@@ -47,6 +66,8 @@ class GeminiHTTPMCPServer:
         self.host = host
         self.port = port
         
+        self._init_search_state()
+        
         # Create FastAPI app
         self.app = FastAPI(
             title="Gemini Context Extractor MCP Server",
@@ -72,6 +93,93 @@ class GeminiHTTPMCPServer:
         # Setup FastAPI routes
         self.setup_routes()
     
+    def _init_search_state(self):
+        """Create the empty conversation cache and search index."""
+        # Parsed conversation files keyed by path, valid while the mtime matches
+        self._conv_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Inverted index of lowercased word tokens to conversation files
+        self._index: Dict[str, Set[Path]] = defaultdict(set)
+        self._index_mtime: Dict[Path, int] = {}
+        self._index_tokens: Dict[Path, Set[str]] = {}
+    
+    def _load_conv(self, path: Path) -> Dict[str, Any]:
+        """Return a parsed conversation file, re-reading it only when its mtime changes."""
+        mtime = path.stat().st_mtime_ns
+        cached = self._conv_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        data = _load_json(path)
+        self._conv_cache.pop(path, None)
+        if len(self._conv_cache) >= CONVERSATION_CACHE_SIZE:
+            # Evict the oldest entry
+            del self._conv_cache[next(iter(self._conv_cache))]
+        self._conv_cache[path] = (mtime, data)
+        return data
+    
+    def _unindex(self, path: Path):
+        """Drop one file's tokens from the search index."""
+        for token in self._index_tokens.pop(path, ()):
+            paths = self._index[token]
+            paths.discard(path)
+            if not paths:
+                del self._index[token]
+        self._index_mtime.pop(path, None)
+    
+    def _refresh_index(self, extracts_dir: Path) -> List[Path]:
+        """Index new or modified conversation files, drop deleted ones, and return all files."""
+        files = list(extracts_dir.glob("structured_*.json"))
+        
+        for json_file in files:
+            try:
+                mtime = json_file.stat().st_mtime_ns
+                if self._index_mtime.get(json_file) == mtime:
+                    continue
+                
+                data = self._load_conv(json_file)
+                text = data.get("title", "") + " " + " ".join(
+                    msg.get("content", "") for msg in data.get("messages", [])
+                )
+                tokens = set(_TOKEN_RE.findall(text.lower()))
+                
+                self._unindex(json_file)
+                for token in tokens:
+                    self._index[token].add(json_file)
+                self._index_tokens[json_file] = tokens
+                self._index_mtime[json_file] = mtime
+            except Exception as e:
+                logging.warning(f"Error indexing {json_file}: {e}")
+        
+        for json_file in set(self._index_mtime) - set(files):
+            self._unindex(json_file)
+        
+        return files
+    
+    def _index_candidates(self, query_lower: str) -> Optional[Set[Path]]:
+        """Files that may contain the query; None when the query has no word tokens.
+        
+        Inner query tokens must be whole indexed tokens; the first and last may be
+        cut off mid-word, so they only need to appear inside an indexed token.
+        """
+        tokens = _TOKEN_RE.findall(query_lower)
+        if not tokens:
+            return None
+        
+        candidates = None
+        for i, token in enumerate(tokens):
+            if 0 < i < len(tokens) - 1:
+                paths = self._index.get(token, set())
+            else:
+                paths = set()
+                for word, word_paths in self._index.items():
+                    if token in word:
+                        paths |= word_paths
+            candidates = paths if candidates is None else candidates & paths
+            if not candidates:
+                break
+        return candidates
+    
     def setup_mcp_tools(self):
         """Setup MCP tools for AI agents."""
         
@@ -79,6 +187,8 @@ class GeminiHTTPMCPServer:
         async def extract_conversation(url: str, title: str = "") -> Dict[str, Any]:
             """Extract a Gemini conversation from URL with structured parsing."""
             try:
+                from .enhanced_gemini_extractor import EnhancedGeminiExtractor
+                
                 extractor = EnhancedGeminiExtractor(
                     cdp_port=self.config.browser.cdp_port,
                     output_dir=self.config.extraction.output_dir
@@ -105,11 +215,18 @@ class GeminiHTTPMCPServer:
                 # For now, search in extracted conversations
                 extracts_dir = Path(self.config.extraction.output_dir)
                 results = []
+                query_lower = query.lower()
                 
-                for json_file in extracts_dir.glob("structured_*.json"):
+                # The index narrows the files down; each candidate is still verified
+                files = self._refresh_index(extracts_dir)
+                candidates = self._index_candidates(query_lower)
+                
+                for json_file in files:
+                    if candidates is not None and json_file not in candidates:
+                        continue
+                    
                     try:
-                        with open(json_file, 'r') as f:
-                            data = json.load(f)
+                        data = self._load_conv(json_file)
                         
                         # Simple text search in title and messages
                         title = data.get("title", "")
@@ -117,11 +234,11 @@ class GeminiHTTPMCPServer:
                         
                         # Check if query matches title or any message content
                         matches = False
-                        if query.lower() in title.lower():
+                        if query_lower in title.lower():
                             matches = True
                         else:
                             for msg in messages:
-                                if query.lower() in msg.get("content", "").lower():
+                                if query_lower in msg.get("content", "").lower():
                                     matches = True
                                     break
                         
@@ -157,6 +274,8 @@ class GeminiHTTPMCPServer:
         async def analyze_conversations(include_details: bool = True) -> Dict[str, Any]:
             """Analyze all extracted conversations and provide insights."""
             try:
+                from .conversation_analyzer import ConversationAnalyzer
+                
                 analyzer = ConversationAnalyzer(self.config.extraction.output_dir)
                 summary, analyses = analyzer.analyze_all_conversations()
                 
@@ -185,8 +304,7 @@ class GeminiHTTPMCPServer:
                 
                 for json_file in extracts_dir.glob("structured_*.json"):
                     try:
-                        with open(json_file, 'r') as f:
-                            data = json.load(f)
+                        data = self._load_conv(json_file)
                         
                         conv_info = {
                             "id": json_file.stem,
@@ -235,8 +353,7 @@ class GeminiHTTPMCPServer:
                         "message": f"No conversation found with ID: {conversation_id}"
                     }
                 
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
+                data = self._load_conv(json_file)
                 
                 return {
                     "success": True,
@@ -0,0 +1,26 @@
+"""Shared fixtures for the test suite."""
+
+import json
+import os
+
+import pytest
+
+
+def _write_conversation(directory, name, title, *contents, mtime_ns=None):
+    """Write a structured_<name>.json conversation file and return its path."""
+    path = directory / f"structured_{name}.json"
+    path.write_text(json.dumps({
+        "title": title,
+        "url": f"https://gemini.google.com/app/{name}",
+        "message_count": len(contents),
+        "extracted_at": "2025-01-01T00:00:00",
+        "messages": [{"content": content} for content in contents],
+    }), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def write_conversation():
+    return _write_conversation
@@ -0,0 +1,140 @@
+"""Tests for the SQLite full-text conversation index."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from src.conversation_index import ConversationIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ConversationIndex(str(tmp_path))
+    if not idx.available:
+        pytest.skip("SQLite lacks the FTS5 trigram tokenizer")
+    yield idx
+    idx.close()
+
+
+def titles(results):
+    return sorted(result["title"] for result in results)
+
+
+def test_search_is_case_insensitive_substring(tmp_path, index, write_conversation):
+    write_conversation(tmp_path, "a", "Speed", "I run Faster than before")
+    write_conversation(tmp_path, "b", "Plural", "he runs daily")
+    index.refresh()
+
+    assert titles(index.search("run fast")) == ["Speed"]
+    assert titles(index.search("ster")) == ["Speed"]
+    assert titles(index.search("RUNS")) == ["Plural"]
+    assert titles(index.search("speed")) == ["Speed"]
+    assert index.search("running") == []
+
+
+def test_short_queries_fall_back_to_scanning(tmp_path, index, write_conversation):
+    write_conversation(tmp_path, "a", "Alpha", "xy")
+    write_conversation(tmp_path, "b", "Beta", "zz")
+    index.refresh()
+
+    assert titles(index.search("XY")) == ["Alpha"]
+    assert titles(index.search("")) == ["Alpha", "Beta"]
+
+
+def test_search_respects_limit_after_verification(tmp_path, index, write_conversation):
+    for i in range(5):
+        write_conversation(tmp_path, f"c{i}", f"Conv {i}", "shared phrase here")
+    index.refresh()
+
+    assert len(index.search("shared phrase", limit=3)) == 3
+
+
+def test_search_matches_plain_scan(tmp_path, index, write_conversation):
+    texts = ["hello world", "Hello, World!", "worldly hellos", "ÉCOLE d'été", "foo-bar baz"]
+    for i, text in enumerate(texts):
+        write_conversation(tmp_path, f"t{i}", f"Title {i}", text)
+    index.refresh()
+
+    for query in ["hello", "o w", "world!", "école", "été", "-bar", "lo, w", "zzz", "ba"]:
+        expected = sorted(
+            f"Title {i}" for i, text in enumerate(texts)
+            if query.lower() in f"title {i}\n{text}".lower()
+        )
+        assert titles(index.search(query, limit=100)) == expected, query
+
+
+def test_matches_never_span_two_fields(tmp_path, index, write_conversation):
+    write_conversation(tmp_path, "a", "Title", "first message", "second message")
+    index.refresh()
+
+    assert index.search("title\nfirst") == []
+    assert index.search("message\nsecond") == []
+    assert index.search("message\x1fsecond") == []
+    assert titles(index.search("second message")) == ["Title"]
+
+
+def test_null_fields_are_indexed_as_empty(tmp_path, index):
+    path = tmp_path / "structured_null.json"
+    path.write_text(json.dumps({
+        "title": None,
+        "messages": [{"content": None}, {"content": "still searchable"}],
+    }), encoding="utf-8")
+    index.refresh()
+
+    results = index.search("searchable")
+    assert [result["file"] for result in results] == [str(path)]
+
+
+def test_refresh_picks_up_modified_and_deleted_files(tmp_path, index, write_conversation):
+    kept = write_conversation(tmp_path, "kept", "Kept", "original text", mtime_ns=1_000)
+    gone = write_conversation(tmp_path, "gone", "Gone", "original text")
+    index.refresh()
+    assert titles(index.search("original")) == ["Gone", "Kept"]
+
+    write_conversation(tmp_path, "kept", "Kept", "rewritten text", mtime_ns=2_000)
+    gone.unlink()
+    index.refresh()
+
+    assert index.search("original") == []
+    assert titles(index.search("rewritten")) == ["Kept"]
+    assert index.search("rewritten")[0]["file"] == str(kept)
+
+
+def test_refresh_skips_unchanged_files(tmp_path, index, write_conversation):
+    path = write_conversation(tmp_path, "a", "Alpha", "first", mtime_ns=1_000)
+    index.refresh()
+
+    # Same mtime: the stale index entry is kept rather than re-read
+    write_conversation(tmp_path, "a", "Alpha", "second", mtime_ns=1_000)
+    index.refresh()
+    assert titles(index.search("first")) == ["Alpha"]
+
+    os.utime(path, ns=(3_000, 3_000))
+    index.refresh()
+    assert titles(index.search("second")) == ["Alpha"]
+
+
+def test_old_porter_index_is_rebuilt(tmp_path, write_conversation):
+    db_path = tmp_path / "index.sqlite"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE VIRTUAL TABLE convs USING fts5("
+        "id UNINDEXED, file UNINDEXED, title, url UNINDEXED, "
+        "message_count UNINDEXED, extracted_at UNINDEXED, content, "
+        "tokenize='porter unicode61')"
+    )
+    conn.execute("CREATE TABLE indexed_files (file TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    write_conversation(tmp_path, "a", "Speed", "run faster")
+    idx = ConversationIndex(str(tmp_path))
+    if not idx.available:
+        pytest.skip("SQLite lacks the FTS5 trigram tokenizer")
+    try:
+        idx.refresh()
+        assert titles(idx.search("ster")) == ["Speed"]
+    finally:
+        idx.close()
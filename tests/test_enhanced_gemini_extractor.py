@@ -0,0 +1,81 @@
+"""Tests for EnhancedGeminiExtractor's page pool."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("bs4")
+
+from src import enhanced_gemini_extractor as extractor_module
+from src.enhanced_gemini_extractor import EnhancedGeminiExtractor
+
+
+class FakePage:
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = [FakePage()]  # the user's open tab
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = [FakeContext()]
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browser = FakeBrowser()
+        self.chromium = self
+        self.stopped = False
+
+    async def connect_over_cdp(self, url):
+        return self.browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        self.stopped = True
+
+
+def test_extract_many_uses_a_distinct_page_per_task(tmp_path, monkeypatch):
+    driver = FakePlaywright()
+    monkeypatch.setattr(extractor_module, "async_playwright", lambda: driver)
+    extractor = EnhancedGeminiExtractor(output_dir=str(tmp_path), pool_size=3)
+
+    in_use = set()
+    used = []
+
+    async def fake_extract(url, title=""):
+        async with extractor.acquire_page() as page:
+            assert page not in in_use
+            in_use.add(page)
+            used.append(page)
+            await asyncio.sleep(0.01)
+            in_use.discard(page)
+            return url
+
+    monkeypatch.setattr(extractor, "extract_conversation_with_structure", fake_extract)
+
+    urls = [(f"https://gemini.google.com/app/{i}", "") for i in range(8)]
+    results = asyncio.run(extractor.extract_many(urls, concurrency=10))
+
+    assert results == [url for url, _ in urls]
+    user_tab = driver.browser.contexts[0].pages[0]
+    assert user_tab not in used
+    assert len(set(used)) == 3
+    # The pool opened for this call is closed again
+    assert driver.stopped
+    assert extractor._page_pool is None
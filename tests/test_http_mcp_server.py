@@ -0,0 +1,103 @@
+"""Tests for the HTTP MCP server's conversation cache and search index."""
+
+import json
+import os
+import random
+
+import pytest
+
+from src.http_mcp_server import GeminiHTTPMCPServer
+
+
+WORDS = ["alpha", "beta", "gamma", "Delta", "hello world", "foo-bar", "x?y", "ünïcode", "run faster"]
+
+QUERIES = [
+    "alp", "lpha bet", "a b", "world foo", "-bar x", "?", "hello", "o w", "ÜNÏ",
+    "gamma delta alpha", "zzz", "a delta g", " ", "", "run fast", "ster", "runs",
+]
+
+
+@pytest.fixture
+def server():
+    # Only the search state is needed, not the FastAPI app or FastMCP
+    srv = GeminiHTTPMCPServer.__new__(GeminiHTTPMCPServer)
+    srv._init_search_state()
+    return srv
+
+
+def brute_force_matches(directory, query):
+    """The original search_conversations test: substring of title or any message."""
+    query_lower = query.lower()
+    matches = set()
+    for path in directory.glob("structured_*.json"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if query_lower in data["title"].lower() or any(
+            query_lower in msg["content"].lower() for msg in data["messages"]
+        ):
+            matches.add(path)
+    return matches
+
+
+def assert_candidates_cover_matches(server, directory):
+    files = server._refresh_index(directory)
+    assert set(files) == set(directory.glob("structured_*.json"))
+    for query in QUERIES:
+        candidates = server._index_candidates(query.lower())
+        matches = brute_force_matches(directory, query)
+        if candidates is None:
+            continue  # no word tokens: every file is scanned
+        assert matches <= candidates, query
+
+
+def test_index_candidates_cover_brute_force_matches(tmp_path, server, write_conversation):
+    rng = random.Random(1234)
+    for i in range(40):
+        contents = [" ".join(rng.choice(WORDS) for _ in range(5)) for _ in range(3)]
+        write_conversation(tmp_path, str(i), rng.choice(WORDS), *contents)
+
+    assert_candidates_cover_matches(server, tmp_path)
+
+
+def test_index_candidates_follow_modified_and_deleted_files(tmp_path, server, write_conversation):
+    write_conversation(tmp_path, "a", "Alpha", "hello world", mtime_ns=1_000)
+    doomed = write_conversation(tmp_path, "b", "Beta", "gamma")
+    assert_candidates_cover_matches(server, tmp_path)
+
+    write_conversation(tmp_path, "a", "Alpha", "run faster", mtime_ns=2_000)
+    doomed.unlink()
+    assert_candidates_cover_matches(server, tmp_path)
+
+    assert server._index_candidates("gamma") == set()
+    assert server._index_candidates("hello") == set()
+    assert all(doomed not in paths for paths in server._index.values())
+
+
+def test_index_candidates_narrow_the_search(tmp_path, server, write_conversation):
+    hit = write_conversation(tmp_path, "hit", "Notes", "the quick brown fox")
+    write_conversation(tmp_path, "miss", "Other", "nothing relevant")
+    server._refresh_index(tmp_path)
+
+    assert server._index_candidates("quick brown") == {hit}
+    assert server._index_candidates("ick bro") == {hit}
+    assert server._index_candidates("...") is None
+
+
+def test_load_conv_rereads_only_when_mtime_changes(tmp_path, server, write_conversation):
+    path = write_conversation(tmp_path, "a", "First", mtime_ns=1_000)
+    assert server._load_conv(path)["title"] == "First"
+
+    # Same mtime: the cached parse is returned
+    write_conversation(tmp_path, "a", "Second", mtime_ns=1_000)
+    assert server._load_conv(path)["title"] == "First"
+
+    os.utime(path, ns=(2_000, 2_000))
+    assert server._load_conv(path)["title"] == "Second"
+
+
+def test_load_conv_evicts_oldest_entry(tmp_path, server, monkeypatch, write_conversation):
+    monkeypatch.setattr("src.http_mcp_server.CONVERSATION_CACHE_SIZE", 3)
+    paths = [write_conversation(tmp_path, str(i), f"T{i}") for i in range(4)]
+    for path in paths:
+        server._load_conv(path)
+
+    assert list(server._conv_cache) == paths[1:]